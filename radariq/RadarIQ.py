@@ -4,12 +4,14 @@
 # SPDX-License-Identifier:    MIT
 
 from __future__ import division
+import functools
 import logging
-import time
+import numbers
+import struct
 import threading
 
-from radariq.compatability import pack, unpack, as_hex, int_to_bytes, queue
-from radariq.TSerial import TSerial, CONNECTION_DISCONNECTED
+from radariq.compatability import as_hex, int_to_bytes, monotonic
+from radariq.TSerial import TSerial, SignalledDeque, CONNECTION_DISCONNECTED
 import radariq.units_converter as units
 from radariq.port_manager import find_com_port
 import numpy as np
@@ -42,9 +44,115 @@ OBJECT_TYPE_FAST_VEHICLE = 4
 OUTPUT_LIST = 0
 OUTPUT_NUMPY = 1
 
+# Layout of a single point in a point cloud packet (positions in mm, velocity in mm/s)
+POINT_CLOUD_DTYPE = np.dtype([('x', '<i2'), ('y', '<i2'), ('z', '<i2'), ('intensity', 'u1'), ('velocity', '<i2')])
+# The same layout with x, y and z viewed as one (3,) field
+_POINT_CLOUD_POSITION = np.dtype({'names': ['position'], 'formats': [('<i2', (3,))], 'offsets': [0],
+                                  'itemsize': POINT_CLOUD_DTYPE.itemsize})
+
+# Layout of a single object in an object tracking packet (tracking id, then position in mm, velocity in mm/s and
+# acceleration in mm/s^2 as x, y, z)
+OBJECT_DTYPE = np.dtype([('tracking_id', 'i1'), ('position', '<i2', (3,)), ('velocity', '<i2', (3,)),
+                         ('acceleration', '<i2', (3,))])
+
+# First byte of a log message sent by the sensor
+_MESSAGE_PACKET = int_to_bytes(0x00)
+
+# Packet layouts
+_COMMAND = struct.Struct("<BB")  # command, variant
+_COMMAND_BYTE = struct.Struct("<BBB")  # command, variant, one byte value
+_VERSION = struct.Struct("<BBBBHBBH")
+_APPLICATION_VERSION = struct.Struct("<BBB20sBBH")
+_SERIAL_NUMBER = struct.Struct("<BBLL")
+_DISTANCE_FILTER = struct.Struct("<BBHH")
+_ANGLE_FILTER = struct.Struct("<BBbb")
+_HEIGHT_FILTER = struct.Struct("<BBhh")
+_MESSAGE_HEADER = struct.Struct("<BBBB")  # command, variant, message type, message code
+_SUBFRAME_HEADER = struct.Struct("<BB")  # subframe type, count
+_CORE_STATISTICS = struct.Struct("<7L10h")
+_POINT_CLOUD_STATISTICS = struct.Struct("<6L2B")
+_OBJECT = struct.Struct("<b9h")  # one object of an object tracking subframe (see OBJECT_DTYPE)
+
+# Python log level for each type of message sent by the sensor
+_MESSAGE_LOG_LEVELS = {0: logging.DEBUG, 1: logging.DEBUG, 2: logging.INFO, 5: logging.INFO, 3: logging.WARNING,
+                       4: logging.ERROR}
+
+# Settings which are a single byte value:
+# command -> (value type, allowed values, error when the type is wrong, error when the value is not allowed)
+_BYTE_SETTINGS = {
+    0x04: (numbers.Integral, frozenset(range(21)), "Frame rate must be an integer",
+           "Frame rate must be between 0 and 20 fps"),
+    0x05: (numbers.Integral, frozenset((MODE_POINT_CLOUD, MODE_OBJECT_TRACKING)), "Invalid mode", "Invalid mode"),
+    0x08: (numbers.Integral, frozenset((MOVING_BOTH, MOVING_OBJECTS_ONLY)), "Moving filter value is invalid",
+           "Moving filter value is invalid"),
+    0x10: (numbers.Integral, frozenset((DENSITY_NORMAL, DENSITY_DENSE, DENSITY_VERY_DENSE)),
+           "Invalid point density setting", "Invalid point density setting"),
+    0x11: (numbers.Integral, frozenset(range(10)), "Sensitivity must be an integer between 0 and 9",
+           "Sensitivity must be an integer between 0 and 9"),
+    0x16: (numbers.Integral, frozenset(range(2)), "Invalid object type mode", "Invalid object type mode"),
+    0x17: (bool, frozenset((False, True)), "Auto start must be a boolean", "Auto start must be a boolean"),
+}
+
+# Settings where the values echoed back by the sensor are not checked against the values sent
+_UNCHECKED_SETTINGS = frozenset((0x07,))
+
+# Settings accepted by RadarIQ.configure: name -> function building the packet which applies the setting
+_SETTING_PACKETS = {
+    'frame_rate': lambda riq, value: riq._byte_setting_packet(0x04, value),
+    'mode': lambda riq, value: riq._byte_setting_packet(0x05, value),
+    'distance_filter': lambda riq, value: riq._distance_filter_packet(*value),
+    'angle_filter': lambda riq, value: riq._angle_filter_packet(*value),
+    'moving_filter': lambda riq, value: riq._byte_setting_packet(0x08, value),
+    'point_density': lambda riq, value: riq._byte_setting_packet(0x10, value),
+    'sensitivity': lambda riq, value: riq._byte_setting_packet(0x11, value),
+    'height_filter': lambda riq, value: riq._height_filter_packet(*value),
+    'object_type_mode': lambda riq, value: riq._byte_setting_packet(0x16, value),
+    'auto_start': lambda riq, value: riq._byte_setting_packet(0x17, value),
+}
+
+# Longest time (in seconds) to wait for the sensor to acknowledge a stop
+STOP_TIMEOUT = 0.5
+
+# Longest time (in seconds) the capture thread waits for a packet before checking if the capture has been stopped
+CAPTURE_WAIT_TIMEOUT = 0.1
+
 log = logging.getLogger('RadarIQ')
 
 
+def _decode_asciiz(data):
+    """
+    Decodes a NUL padded ASCII string sent by the sensor.
+
+    :param data: The string as received
+    :type data: bytes
+    :return: The string without the padding
+    :rtype: str
+    """
+    return data.rstrip(b'\x00').decode('ascii', 'replace')
+
+
+def _cmd(error):
+    """
+    Decorator for the sensor commands which replaces any failure with an Exception carrying the error message.
+
+    ValueErrors raised while validating arguments are passed through unchanged.
+
+    :param error: The error message to raise when the command fails
+    :type error: str
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return fn(self, *args, **kwargs)
+            except ValueError:
+                raise
+            except Exception:
+                raise Exception(error)
+        return wrapper
+    return decorator
+
+
 class RadarIQ:
     """
     API Wrapper for the RadarIQ-M1 sensor
@@ -60,7 +168,7 @@ class RadarIQ:
     :type connection_status_callback: def
     :param queue_length: The maximum length of the data queue.
                          Set to 0 to buffer all data until it has been processed or set to a lower number to discard
-                         data if the queue is too long.
+                         the oldest data if the queue is too long.
                          This is useful to prevent the data getting out of sync with reality if the consuming
                          application is not consuming the data fast enough.
     :type queue_length: int
@@ -79,10 +187,16 @@ class RadarIQ:
         self.application_connection_status_callback = connection_status_callback
         self.connection = TSerial(port=port, baudrate=115200,
                                   connection_status_callback=self._connection_status_callback, *args, **kwargs)
-        self.data_queue = queue.Queue(queue_length)
+        # Frames are handed from the capture thread to the application through a ring buffer which drops the oldest
+        # frame when full
+        self.data_queue = SignalledDeque(maxlen=queue_length or None)
         self.distance_units = "m"
         self.speed_units = "m/s"
         self.acceleration_units = 'm/s^2'
+        # Conversion factors from SI units for the units above, cached so they are not looked up per sample
+        self._distance_factor = units.distance_lookup[self.distance_units]
+        self._speed_factor = units.speed_lookup[self.speed_units]
+        self._acceleration_factor = units.acceleration_lookup[self.acceleration_units]
         self.mirror = False
         self.is_capturing = False
         self.capture_max = 0
@@ -94,6 +208,7 @@ class RadarIQ:
                            'point_cloud': None,
                            'rx_buffer_length': None,
                            'rx_packet_queue': None}
+        self._raw_statistics = {}  # The latest statistics packet of each type, decoded by get_statistics
 
         self.clean_start()
 
@@ -102,8 +217,8 @@ class RadarIQ:
 
     def clean_start(self):
         self.stop()
-        time.sleep(0.5)  # wait for the sensor to stop (if it is running)
-        self.connection.emtpy_queue()
+        self._wait_for_stop()
+        self.connection.empty_queue()
 
     def close(self):
         """
@@ -112,7 +227,7 @@ class RadarIQ:
         """
         try:
             self.stop()
-            time.sleep(0.5)  # wait for the sensor to stop before closing the serial connection
+            self._wait_for_stop()  # wait for the sensor to stop before closing the serial connection
             self.connection.stop()
             self.connection.close()
         except Exception:
@@ -126,28 +241,179 @@ class RadarIQ:
         :type msg: bytes
         """
         # print("Sending: " + as_hex(msg))
+        self.connection.send_packet(msg)
+
+    def _send_with_flush(self, msg):
+        """
+        Discard anything already received then send a message on to the serial bus.
+
+        Used when starting a capture so that the data returned is only data captured after this message.
+
+        :param msg: message to send
+        :type msg: bytes
+        """
         self.connection.flush_all()
         self.connection.send_packet(msg)
 
-    def _read(self):
+    def _read(self, command=None, timeout=None):
         """
         Read a message from the queue.
 
+        :param command: When given, packets which are not a response to this command are discarded (such as a late
+                        response to an earlier command or data from a capture which has just been stopped)
+        :type command: int
+        :param timeout: Seconds to wait for the message (defaults to the timeout of this class)
+        :type timeout: float
         :return: message
         :rtype: bytes
         """
-        start_time = time.time()
-        while time.time() < (start_time + self.timeout):
-            msg = self.connection.read_from_queue()
+        if timeout is None:
+            timeout = self.timeout
+        command_byte = None if command is None else int_to_bytes(command)
+        deadline = monotonic() + timeout
+        remaining = timeout
+        while remaining > 0:
+            msg = self.connection.read_from_queue(remaining)
+            remaining = deadline - monotonic()
 
             if msg is not None:
                 # print("Receiving:", as_hex(msg))
-                if msg[0:1] == int_to_bytes(0x00):  # Message packet. Send to log instead of processing normally
+                if msg[0:1] == _MESSAGE_PACKET:  # Message packet. Send to log instead of processing normally
                     self._process_message(msg)
-                else:
+                elif command_byte is None or msg[0:1] == command_byte:
                     return msg
         raise Exception("Timeout while reading from the RadarIQ sensor")
 
+    def _byte_setting_packet(self, command, value):
+        """
+        Validates a single byte setting (see _BYTE_SETTINGS) and builds the packet to set it.
+
+        :param command: The command for the setting
+        :type command: int
+        :param value: The value to set
+        :return: The packet to send
+        :rtype: bytes
+        """
+        value_type, allowed, type_error, value_error = _BYTE_SETTINGS[command]
+        if not isinstance(value, value_type):
+            raise ValueError(type_error)
+        if value not in allowed:
+            raise ValueError(value_error)
+
+        return _COMMAND_BYTE.pack(command, 0x02, value)
+
+    def _distance_filter_packet(self, minimum, maximum):
+        """
+        Validates the distance filter and builds the packet to set it.
+
+        :param minimum: The minimum distance (in units as specified by :meth:`set_units`)
+        :type minimum: number
+        :param maximum: The maximum distance (in units as specified by :meth:`set_units`)
+        :type maximum: number
+        :return: The packet to send
+        :rtype: bytes
+        """
+        # The sensor accepts 0 to 10m. The limit is rounded the same way as the values from get_distance_filter so
+        # that the maximum it reports can be set again.
+        limit = units.round_sig(10 * self._distance_factor)
+
+        if not (isinstance(minimum, numbers.Real) and 0 <= minimum <= limit):
+            raise ValueError("Distance filter minimum must be a number between 0 and {:g}{}".format(
+                limit, self.distance_units))
+
+        if not (isinstance(maximum, numbers.Real) and 0 <= maximum <= limit):
+            raise ValueError("Distance filter maximum must be a number between 0 and {:g}{}".format(
+                limit, self.distance_units))
+
+        if maximum < minimum:
+            raise ValueError("Distance filter maximum must be greater than the minimum")
+
+        minimum = int(units.round_sig(minimum / self._distance_factor) * 1000)
+        maximum = int(units.round_sig(maximum / self._distance_factor) * 1000)
+
+        return _DISTANCE_FILTER.pack(0x06, 0x02, minimum, maximum)
+
+    def _angle_filter_packet(self, minimum, maximum):
+        """
+        Validates the angle filter and builds the packet to set it.
+
+        :param minimum: The minimum angle (-60 to +60)
+        :type minimum: int
+        :param maximum: The maximum angle (-60 to +60)
+        :type maximum: int
+        :return: The packet to send
+        :rtype: bytes
+        """
+        if not (isinstance(minimum, int) and -55 <= minimum <= 55):
+            raise ValueError("Angle filter minimum must be an integer between -55 and +55")
+
+        if not (isinstance(maximum, int) and -55 <= maximum <= 55):
+            raise ValueError("Angle filter maximum must be an integer between -55 and +55")
+
+        if maximum < minimum:
+            raise ValueError("Angle filter maximum must be greater than the minimum")
+
+        return _ANGLE_FILTER.pack(0x07, 0x02, minimum, maximum)
+
+    def _height_filter_packet(self, minimum, maximum):
+        """
+        Validates the height filter and builds the packet to set it.
+
+        :param minimum: The minimum height (in units as specified by set_units()
+        :type minimum: number
+        :param maximum: The maximum height (in units as specified by set_units()
+        :type maximum: number
+        :return: The packet to send
+        :rtype: bytes
+        """
+        if not isinstance(minimum, numbers.Real):
+            raise ValueError("Height filter minimum must be a number")
+
+        if not isinstance(maximum, numbers.Real):
+            raise ValueError("Height filter maximum must be a number")
+
+        if maximum < minimum:
+            raise ValueError("Height filter maximum must be greater than the minimum")
+
+        minimum = int(units.round_sig(minimum / self._distance_factor) * 1000)
+        maximum = int(units.round_sig(maximum / self._distance_factor) * 1000)
+
+        return _HEIGHT_FILTER.pack(0x12, 0x02, minimum, maximum)
+
+    def _apply_settings(self, packets):
+        """
+        Sends settings packets back to back then collects the sensor's response to each of them.
+
+        The sensor echoes back the values it has set, these are checked against the values which were sent (except
+        for the commands in _UNCHECKED_SETTINGS).
+
+        :param packets: The packets to send (no more than one per command)
+        :type packets: list
+        :return: True if all of the settings were applied
+        :rtype: bool
+        """
+        with self.connection.batched_writes():
+            for packet in packets:
+                self._send(packet)
+
+        for packet in packets:
+            command = _COMMAND.unpack_from(packet)[0]
+            res = self._read(command)
+            if len(res) != len(packet) or _COMMAND.unpack_from(res) != (command, 0x01):
+                raise Exception("Invalid response")
+            if command not in _UNCHECKED_SETTINGS and res[2:] != packet[2:]:
+                raise Exception("Setting did not set correctly")
+        return True
+
+    def _wait_for_stop(self):
+        """
+        Wait for the sensor to acknowledge a stop command, for at most STOP_TIMEOUT seconds.
+        """
+        try:
+            self._read(0x65, STOP_TIMEOUT)
+        except Exception:
+            pass  # No acknowledgement, the sensor has had as long as it needs to stop
+
     def get_mirror(self):
         """
         Gets the mirror setting.
@@ -185,45 +451,41 @@ class RadarIQ:
         :param acceleration_units: The acceleration units to use: "mm/s^2", "m/s^2", "in/s^2", "ft/s^2"
         :type acceleration_units: str
         """
-        try:
-            # Performing a units conversion will throw an exception if the units are not valid
-            if distance_units is not None:
-                units.convert_distance_to_si(distance_units, 1)
-                self.distance_units = distance_units
+        if distance_units is not None and distance_units not in units.distance_lookup:
+            raise ValueError("Invalid units for distance conversion")
+
+        if speed_units is not None and speed_units not in units.speed_lookup:
+            raise ValueError("Invalid units for speed conversion")
 
-            if speed_units is not None:
-                units.convert_speed_to_si(speed_units, 1)
-                self.speed_units = speed_units
+        if acceleration_units is not None and acceleration_units not in units.acceleration_lookup:
+            raise ValueError("Invalid units for acceleration conversion")
 
-            if acceleration_units is not None:
-                units.convert_acceleration_to_si(acceleration_units, 1)
-                self.acceleration_units = acceleration_units
-        except ValueError as err:
-            raise ValueError(err)
+        if distance_units is not None:
+            self.distance_units = distance_units
+            self._distance_factor = units.distance_lookup[distance_units]
+
+        if speed_units is not None:
+            self.speed_units = speed_units
+            self._speed_factor = units.speed_lookup[speed_units]
+
+        if acceleration_units is not None:
+            self.acceleration_units = acceleration_units
+            self._acceleration_factor = units.acceleration_lookup[acceleration_units]
 
     def _process_message(self, msg):
         """
         Process a message onto the python log.
         """
         try:
-            message_length = len(msg) - 4
-            packing = "<BBBB{}s".format(message_length)
-            res = unpack(packing, msg)
-            if res[0] == 0x00 and res[1] == 0x01:
-                message_type = res[2]
-                message_code = res[3]
-                message = res[4].decode().rstrip('\x00')
-                if message_type in [0, 1]:
-                    log.debug('{} {}'.format(message_code, message))
-                elif message_type in [2, 5]:
-                    log.info('{} {}'.format(message_code, message))
-                elif message_type in [3]:
-                    log.warning('{} {}'.format(message_code, message))
-                elif message_type in [4]:
-                    log.error('{} {}'.format(message_code, message))
+            (command, variant, message_type, message_code) = _MESSAGE_HEADER.unpack_from(msg)
+            if command == 0x00 and variant == 0x01:
+                level = _MESSAGE_LOG_LEVELS.get(message_type)
+                if level is not None:
+                    log.log(level, '%s %s', message_code, _decode_asciiz(msg[4:]))
         except Exception:
             raise Exception("Failed to process message from the RadarIQ sensor")
 
+    @_cmd("Failed to get version")
     def get_version(self):
         """
         Gets the version of the hardware and firmware.
@@ -231,17 +493,14 @@ class RadarIQ:
         :return: The sensor version (firmware and hardware)
         :rtype: dict
         """
-        try:
-            self._send(pack("<BB", 0x01, 0x00))
-            res = unpack("<BBBBHBBH", self._read())
-            if res[0] == 0x01 and res[1] == 0x01:
-                return {"firmware": list(res[2:5]), "hardware": list(res[5:8])}
-            else:
-                raise Exception("Invalid response")
-
-        except Exception:
-            raise Exception("Failed to get version")
+        self._send(_COMMAND.pack(0x01, 0x00))
+        res = _VERSION.unpack(self._read(0x01))
+        if res[0] == 0x01 and res[1] == 0x01:
+            return {"firmware": list(res[2:5]), "hardware": list(res[5:8])}
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to get radar versions")
     def get_radar_application_versions(self):
         """
         Gets the version of the radar applications.
@@ -249,36 +508,26 @@ class RadarIQ:
         :return: The radar application versions
         :rtype: dict
         """
-        try:
-            data = {'controller': ['', 0, 0, 0],
-                    'application_1': ['', 0, 0, 0],
-                    'application_2': ['', 0, 0, 0],
-                    'application_3': ['', 0, 0, 0],
-                    }
-            self._send(pack("<BBB", 0x14, 0x00, 0x01))
-            res = unpack("<BBB20sBBH", self._read())  # Slot 1
-            if res[0] == 0x14 and res[1] == 0x01 and res[2] == 1:
-                data['controller'] = [res[3].decode().rstrip('\x00'), res[4], res[5], res[6]]
-
-            self._send(pack("<BBB", 0x14, 0x00, 0x02))
-            res = unpack("<BBB20sBBH", self._read())  # Slot 2
-            if res[0] == 0x14 and res[1] == 0x01 and res[2] == 2:
-                data['application_1'] = [res[3].decode().rstrip('\x00'), res[4], res[5], res[6]]
-
-            self._send(pack("<BBB", 0x14, 0x00, 0x03))
-            res = unpack("<BBB20sBBH", self._read())  # Slot 3
-            if res[0] == 0x14 and res[1] == 0x01 and res[2] == 3:
-                data['application_2'] = [res[3].decode().rstrip('\x00'), res[4], res[5], res[6]]
-
-            self._send(pack("<BBB", 0x14, 0x00, 0x04))
-            res = unpack("<BBB20sBBH", self._read())  # Slot 4
-            if res[0] == 0x14 and res[1] == 0x01 and res[2] == 4:
-                data['application_3'] = [res[3].decode().rstrip('\x00'), res[4], res[5], res[6]]
-
-            return data
-        except Exception as err:
-            raise Exception("Failed to get radar versions")
+        data = {'controller': ['', 0, 0, 0],
+                'application_1': ['', 0, 0, 0],
+                'application_2': ['', 0, 0, 0],
+                'application_3': ['', 0, 0, 0],
+                }
+        slots = {1: 'controller', 2: 'application_1', 3: 'application_2', 4: 'application_3'}
 
+        # Send all the queries up front then collect the responses, which identify their slot
+        with self.connection.batched_writes():
+            for slot in slots:
+                self.connection.send_packet(_COMMAND_BYTE.pack(0x14, 0x00, slot))
+
+        for _ in slots:
+            res = _APPLICATION_VERSION.unpack(self._read(0x14))
+            if res[0] == 0x14 and res[1] == 0x01 and res[2] in slots:
+                data[slots[res[2]]] = [_decode_asciiz(res[3]), res[4], res[5], res[6]]
+
+        return data
+
+    @_cmd("Failed to get serial")
     def get_serial_number(self):
         """
         Gets the serial of the sensor.
@@ -286,17 +535,14 @@ class RadarIQ:
         :return: The sensors serial number
         :rtype: str
         """
-        try:
-            self._send(pack("<BB", 0x02, 0x00))
-            res = unpack("<BBLL", self._read())
-            if res[0] == 0x02 and res[1] == 0x01:
-                return "{}-{}".format(res[2], res[3])
-            else:
-                raise Exception("Invalid response")
-
-        except Exception:
-            raise Exception("Failed to get serial")
+        self._send(_COMMAND.pack(0x02, 0x00))
+        res = _SERIAL_NUMBER.unpack(self._read(0x02))
+        if res[0] == 0x02 and res[1] == 0x01:
+            return "{}-{}".format(res[2], res[3])
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to reset sensor")
     def reset(self, code):
         """
         Resets the sensor.
@@ -307,16 +553,14 @@ class RadarIQ:
         if not 0 <= code <= 1:
             raise ValueError("Invalid reset code")
 
-        try:
-            self._send(pack("<BBB", 0x03, 0x02, code))
-            res = unpack("<BB", self._read())
-            if res[0] == 0x03 and res[1] == 0x01:
-                return True
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to reset sensor")
+        self._send(_COMMAND_BYTE.pack(0x03, 0x02, code))
+        res = _COMMAND.unpack(self._read(0x03))
+        if res[0] == 0x03 and res[1] == 0x01:
+            return True
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to get frame rate")
     def get_frame_rate(self):
         """
         Gets the frequency with which to capture frames of data (frames/second) from the sensor.
@@ -324,16 +568,14 @@ class RadarIQ:
         :return: The frame rate as it is set in the sensor
         :rtype: int
         """
-        try:
-            self._send(pack("<BB", 0x04, 0x00))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x04 and res[1] == 0x01:
-                return res[2]
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get frame rate")
+        self._send(_COMMAND.pack(0x04, 0x00))
+        res = _COMMAND_BYTE.unpack(self._read(0x04))
+        if res[0] == 0x04 and res[1] == 0x01:
+            return res[2]
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set frame rate")
     def set_frame_rate(self, frame_rate):
         """
         Sets the frequency with which to capture frames of data.
@@ -341,26 +583,9 @@ class RadarIQ:
         :param frame_rate: The frame rate frames/second)
         :type frame_rate: int
         """
+        return self._apply_settings([self._byte_setting_packet(0x04, frame_rate)])
 
-        if not isinstance(frame_rate, int):
-            raise ValueError("Frame rate must be an integer")
-
-        if not 0 <= frame_rate <= 20:
-            raise ValueError("Frame rate must be between 0 and 20 fps")
-
-        try:
-            self._send(pack("<BBB", 0x04, 0x02, frame_rate))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x04 and res[1] == 0x01:
-                if res[2] == frame_rate:
-                    return True
-                else:
-                    raise Exception("Frame rate did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set frame rate")
-
+    @_cmd("Failed to get mode")
     def get_mode(self):
         """
         Gets the capture mode from the sensor.
@@ -368,16 +593,14 @@ class RadarIQ:
         :return: The capture mode. See `Capture Modes`_
         :rtype: int
         """
-        try:
-            self._send(pack("<BB", 0x05, 0x00))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x05 and res[1] == 0x01:
-                return res[2]
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get mode")
+        self._send(_COMMAND.pack(0x05, 0x00))
+        res = _COMMAND_BYTE.unpack(self._read(0x05))
+        if res[0] == 0x05 and res[1] == 0x01:
+            return res[2]
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set mode")
     def set_mode(self, mode):
         """
         Sets the capture mode for the sensor.
@@ -386,22 +609,9 @@ class RadarIQ:
         :type mode: int
         :return: None
         """
-        if not 0 <= mode <= 1:
-            raise ValueError("Invalid mode")
-
-        try:
-            self._send(pack("<BBB", 0x05, 0x02, mode))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x05 and res[1] == 0x01:
-                if res[2] == mode:
-                    return True
-                else:
-                    raise Exception("Mode did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set mode")
+        return self._apply_settings([self._byte_setting_packet(0x05, mode)])
 
+    @_cmd("Failed to get distance filter")
     def get_distance_filter(self):
         """
         Gets the distance filter applied to the readings.
@@ -417,18 +627,16 @@ class RadarIQ:
 
         :rtype: dict
         """
-        try:
-            self._send(pack("<BB", 0x06, 0x00))
-            res = unpack("<BBHH", self._read())
-            if res[0] == 0x06 and res[1] == 0x01:
-                minimum = units.convert_distance_from_si(self.distance_units, res[2] / 1000)
-                maximum = units.convert_distance_from_si(self.distance_units, res[3] / 1000)
-                return {"minimum": minimum, "maximum": maximum}
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get distance filter")
+        self._send(_COMMAND.pack(0x06, 0x00))
+        res = _DISTANCE_FILTER.unpack(self._read(0x06))
+        if res[0] == 0x06 and res[1] == 0x01:
+            minimum = units.round_sig(res[2] / 1000 * self._distance_factor)
+            maximum = units.round_sig(res[3] / 1000 * self._distance_factor)
+            return {"minimum": minimum, "maximum": maximum}
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set distance filter")
     def set_distance_filter(self, minimum, maximum):
         """
         Sets the distance filter applied to the readings.
@@ -438,31 +646,9 @@ class RadarIQ:
         :param maximum: The maximum distance (in units as specified by :meth:`set_units`)
         :type maximum: number
         """
-        minimum = int(units.convert_distance_to_si(self.distance_units, minimum) * 1000)
-        maximum = int(units.convert_distance_to_si(self.distance_units, maximum) * 1000)
-
-        if not (isinstance(minimum, int) and 0 <= minimum <= 10000):
-            raise ValueError("Distance filter minimum must be a number between 0 and 10000mm")
-
-        if not (isinstance(maximum, int) and 0 <= maximum <= 10000):
-            raise ValueError("Distance filter maximum must be a number between 0 and 10000mm")
-
-        if maximum < minimum:
-            raise ValueError("Distance filter maximum must be greater than the minimum")
-
-        try:
-            self._send(pack("<BBHH", 0x06, 0x02, minimum, maximum))
-            res = unpack("<BBHH", self._read())
-            if res[0] == 0x06 and res[1] == 0x01:
-                if res[2] == minimum and res[3] == maximum:
-                    return True
-                else:
-                    raise Exception("Distance filter did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set distance filter")
+        return self._apply_settings([self._distance_filter_packet(minimum, maximum)])
 
+    @_cmd("Failed to get angle filter")
     def get_angle_filter(self):
         """
         Gets the angle filter applied to the readings (in degrees).
@@ -477,16 +663,14 @@ class RadarIQ:
 
         :rtype: dict
         """
-        try:
-            self._send(pack("<BB", 0x07, 0x00))
-            res = unpack("<BBbb", self._read())
-            if res[0] == 0x07 and res[1] == 0x01:
-                return {"minimum": res[2], "maximum": res[3]}
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get angle filter")
+        self._send(_COMMAND.pack(0x07, 0x00))
+        res = _ANGLE_FILTER.unpack(self._read(0x07))
+        if res[0] == 0x07 and res[1] == 0x01:
+            return {"minimum": res[2], "maximum": res[3]}
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to get angle filter")
     def set_angle_filter(self, minimum, maximum):
         """
         Sets the angle filter to apply to the readings (in degrees).
@@ -499,25 +683,9 @@ class RadarIQ:
         :param maximum: The maximum angle (-60 to +60)
         :type maximum: int
         """
-        if not (isinstance(minimum, int) and -55 <= minimum <= 55):
-            raise ValueError("Angle filter minimum must be an integer between -55 and +55")
-
-        if not (isinstance(maximum, int) and -55 <= maximum <= 55):
-            raise ValueError("Angle filter maximum must be an integer between -55 and +55")
-
-        if maximum < minimum:
-            raise ValueError("Angle filter maximum must be greater than the minimum")
-
-        try:
-            self._send(pack("<BBbb", 0x07, 0x02, minimum, maximum))
-            res = unpack("<BBbb", self._read())
-            if res[0] == 0x07 and res[1] == 0x01:
-                return True
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get angle filter")
+        return self._apply_settings([self._angle_filter_packet(minimum, maximum)])
 
+    @_cmd("Failed to get moving filter")
     def get_moving_filter(self):
         """
         Gets the moving objects filter applied to the readings.
@@ -525,16 +693,14 @@ class RadarIQ:
         :return: moving filter. See `Moving filter`_
         :rtype: str
         """
-        try:
-            self._send(pack("<BB", 0x08, 0x00))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x08 and res[1] == 0x01:
-                return res[2]
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get moving filter")
+        self._send(_COMMAND.pack(0x08, 0x00))
+        res = _COMMAND_BYTE.unpack(self._read(0x08))
+        if res[0] == 0x08 and res[1] == 0x01:
+            return res[2]
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set moving filter")
     def set_moving_filter(self, moving):
         """
         Sets the moving filter to apply to the readings.
@@ -542,36 +708,49 @@ class RadarIQ:
         :param moving: One of MOVING_BOTH, MOVING_OBJECTS_ONLY
         :type moving: int
         """
+        return self._apply_settings([self._byte_setting_packet(0x08, moving)])
 
-        if not (isinstance(moving, int) and 0 <= moving <= 1):
-            raise ValueError("Moving filter value is invalid")
-        try:
-            self._send(pack("<BBB", 0x08, 0x02, moving))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x08 and res[1] == 0x01:
-                if res[2] == moving:
-                    return True
-                else:
-                    raise Exception("Moving filter did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set moving filter")
+    @_cmd("Failed to configure the sensor")
+    def configure(self, **settings):
+        """
+        Applies several settings at once.
+
+        All of the settings are validated before any are sent. They are then sent back to back so the responses from
+        the sensor are waited on together rather than one setting at a time.
+
+        .. code-block:: python
+
+            riq.configure(mode=MODE_POINT_CLOUD, frame_rate=10, distance_filter=(0, 5), angle_filter=(-45, 45))
+
+        :param settings: Any of frame_rate, mode, distance_filter, angle_filter, moving_filter, point_density,
+                         sensitivity, height_filter, object_type_mode and auto_start. The filters take a
+                         (minimum, maximum) pair, the others take the same value as their set method.
+        :return: True if all of the settings were applied
+        :rtype: bool
+        """
+        packets = []
+        for name, value in settings.items():
+            try:
+                build_packet = _SETTING_PACKETS[name]
+            except KeyError:
+                raise ValueError("Unknown setting: {}".format(name))
+            packets.append(build_packet(self, value))
 
+        return self._apply_settings(packets)
+
+    @_cmd("Failed to save settings")
     def save(self):
         """
         Saves the settings to the sensor.
         """
-        try:
-            self._send(pack("<BB", 0x09, 0x02))
-            res = unpack("<BB", self._read())
-            if res[0] == 0x09 and res[1] == 0x01:
-                return True
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to save settings")
+        self._send(_COMMAND.pack(0x09, 0x02))
+        res = _COMMAND.unpack(self._read(0x09))
+        if res[0] == 0x09 and res[1] == 0x01:
+            return True
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to get point density setting")
     def get_point_density(self):
         """
         Gets the point density setting.
@@ -579,16 +758,14 @@ class RadarIQ:
         :return: Point density. See `Point Density Options`_
         :rtype: int
         """
-        try:
-            self._send(pack("<BB", 0x10, 0x00))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x10 and res[1] == 0x01:
-                return res[2]
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get point density setting")
+        self._send(_COMMAND.pack(0x10, 0x00))
+        res = _COMMAND_BYTE.unpack(self._read(0x10))
+        if res[0] == 0x10 and res[1] == 0x01:
+            return res[2]
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set the point density")
     def set_point_density(self, density):
         """
         Sets the point density setting.
@@ -596,22 +773,9 @@ class RadarIQ:
         :param density: The point density to set. See `Point Density Options`_
         :type density: int
         """
-        if not 0 <= density <= 2:
-            raise ValueError("Invalid point density setting")
-
-        try:
-            self._send(pack("<BBB", 0x10, 0x02, density))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x10 and res[1] == 0x01:
-                if res[2] == density:
-                    return True
-                else:
-                    raise Exception("Point density did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set the point density")
+        return self._apply_settings([self._byte_setting_packet(0x10, density)])
 
+    @_cmd("Failed to get sensitivity setting")
     def get_sensitivity(self):
         """
         Get the point sensitivity setting.
@@ -619,16 +783,14 @@ class RadarIQ:
         :return: Sensitivity setting. See `Sensitivity values`_.
         :rtype: int
         """
-        try:
-            self._send(pack("<BB", 0x11, 0x00))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x11 and res[1] == 0x01:
-                return res[2]
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get sensitivity setting")
+        self._send(_COMMAND.pack(0x11, 0x00))
+        res = _COMMAND_BYTE.unpack(self._read(0x11))
+        if res[0] == 0x11 and res[1] == 0x01:
+            return res[2]
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set the sensitivity setting")
     def set_sensitivity(self, sensitivity):
         """
         Sets the the sensitivity setting to apply to the readings.
@@ -636,22 +798,9 @@ class RadarIQ:
         :param sensitivity: The sensitivity setting to set. See `Sensitivity values`_.
         :type sensitivity: int
         """
-        if not (isinstance(sensitivity, int) and 0 <= sensitivity <= 9):
-            raise ValueError("Sensitivity must be an integer between 0 and 9")
-
-        try:
-            self._send(pack("<BBB", 0x11, 0x02, sensitivity))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x11 and res[1] == 0x01:
-                if res[2] == sensitivity:
-                    return True
-                else:
-                    raise Exception("Sensitivity setting did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set the sensitivity setting")
+        return self._apply_settings([self._byte_setting_packet(0x11, sensitivity)])
 
+    @_cmd("Failed to get height filter")
     def get_height_filter(self):
         """
         Gets the height filter applied to the readings.
@@ -666,18 +815,16 @@ class RadarIQ:
 
         :rtype: dict
         """
-        try:
-            self._send(pack("<BB", 0x12, 0x00))
-            res = unpack("<BBhh", self._read())
-            if res[0] == 0x12 and res[1] == 0x01:
-                minimum = units.convert_distance_from_si(self.distance_units, res[2] / 1000)
-                maximum = units.convert_distance_from_si(self.distance_units, res[3] / 1000)
-                return {"minimum": minimum, "maximum": maximum}
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get height filter")
+        self._send(_COMMAND.pack(0x12, 0x00))
+        res = _HEIGHT_FILTER.unpack(self._read(0x12))
+        if res[0] == 0x12 and res[1] == 0x01:
+            minimum = units.round_sig(res[2] / 1000 * self._distance_factor)
+            maximum = units.round_sig(res[3] / 1000 * self._distance_factor)
+            return {"minimum": minimum, "maximum": maximum}
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set height filter")
     def set_height_filter(self, minimum, maximum):
         """
         Sets the height filter applied to the readings.
@@ -687,32 +834,9 @@ class RadarIQ:
         :param maximum: The maximum height (in units as specified by set_units()
         :type maximum: number
         """
-        minimum = int(units.convert_distance_to_si(self.distance_units, minimum) * 1000)
-        maximum = int(units.convert_distance_to_si(self.distance_units, maximum) * 1000)
-
-        if not (isinstance(minimum, int)):
-            raise ValueError("Height filter minimum must be a number")
-
-        if not (isinstance(maximum, int)):
-            raise ValueError("Height filter maximum must be a number")
-
-        if maximum < minimum:
-            raise ValueError("Height filter maximum must be greater than the minimum")
-
-        try:
-
-            self._send(pack("<BBhh", 0x12, 0x02, minimum, maximum))
-            res = unpack("<BBhh", self._read())
-            if res[0] == 0x12 and res[1] == 0x01:
-                if res[2] == minimum and res[3] == maximum:
-                    return True
-                else:
-                    raise Exception("Height filter did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set height filter")
+        return self._apply_settings([self._height_filter_packet(minimum, maximum)])
 
+    @_cmd("Failed to get object type mode")
     def get_object_type_mode(self):
         """
         Gets the object type mode from the sensor.
@@ -720,16 +844,14 @@ class RadarIQ:
         :return: The object type mode. See `Object Type Modes`_
         :rtype: int
         """
-        try:
-            self._send(pack("<BB", 0x16, 0x00))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x16 and res[1] == 0x01:
-                return res[2]
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get object type mode")
+        self._send(_COMMAND.pack(0x16, 0x00))
+        res = _COMMAND_BYTE.unpack(self._read(0x16))
+        if res[0] == 0x16 and res[1] == 0x01:
+            return res[2]
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set object tracking mode")
     def set_object_type_mode(self, mode):
         """
         Sets the object type mode for the sensor.
@@ -738,22 +860,9 @@ class RadarIQ:
         :type mode: int
         :return: None
         """
-        if not 0 <= mode <= 1:
-            raise ValueError("Invalid object type mode")
-
-        try:
-            self._send(pack("<BBB", 0x16, 0x02, mode))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x16 and res[1] == 0x01:
-                if res[2] == mode:
-                    return True
-                else:
-                    raise Exception("Object Tracking mode did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set object tracking mode")
+        return self._apply_settings([self._byte_setting_packet(0x16, mode)])
 
+    @_cmd("Failed to perform scene calibration")
     def scene_calibration(self):
         """
         Calibrate the sensor to remove any near-field objects from the scene.
@@ -765,12 +874,10 @@ class RadarIQ:
         To use this feature, mount the sensor, ensure that there are no objects within 1m of the sensor then run
         :meth:`scene_calibration`. Once run the scene calibration will be saved to the sensor
         """
-        try:
-            self._send(pack("<BB", 0x15, 0x02))
-            _ = self._read()
-        except Exception:
-            raise Exception("Failed to perform scene calibration")
+        self._send(_COMMAND.pack(0x15, 0x02))
+        _ = self._read(0x15)
 
+    @_cmd("Failed to get auto start")
     def get_auto_start(self):
         """
         Gets the autostart setting.
@@ -778,16 +885,14 @@ class RadarIQ:
         :return: True or False
         :rtype: bool
         """
-        try:
-            self._send(pack("<BB", 0x17, 0x00))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x17 and res[1] == 0x01:
-                return bool(res[2])
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to get auto start")
+        self._send(_COMMAND.pack(0x17, 0x00))
+        res = _COMMAND_BYTE.unpack(self._read(0x17))
+        if res[0] == 0x17 and res[1] == 0x01:
+            return bool(res[2])
+        else:
+            raise Exception("Invalid response")
 
+    @_cmd("Failed to set auto start")
     def set_auto_start(self, auto_start):
         """
         Sets the auto start settings.
@@ -797,23 +902,9 @@ class RadarIQ:
         :param auto_start: The auto start setting (True or False)
         :type auto_start: bool
         """
+        return self._apply_settings([self._byte_setting_packet(0x17, auto_start)])
 
-        if not isinstance(auto_start, bool):
-            raise ValueError("Auto start must be a boolean")
-
-        try:
-            self._send(pack("<BBB", 0x17, 0x02, int(auto_start)))
-            res = unpack("<BBB", self._read())
-            if res[0] == 0x17 and res[1] == 0x01:
-                if res[2] == int(auto_start):
-                    return True
-                else:
-                    raise Exception("Auto start did not set correctly")
-            else:
-                raise Exception("Invalid response")
-        except Exception:
-            raise Exception("Failed to set auto start")
-
+    @_cmd("Failed to start data capture")
     def start(self, samples=0, clear_buffer=True):
         """
         Start to capture data into the queue. To fetch data use get_data() and to stop capture call stop_capture().
@@ -826,28 +917,22 @@ class RadarIQ:
         :param clear_buffer: When set any data currently on the buffer will be cleared before beginning capture
         :type clear_buffer: bool
         """
-        try:
-            if clear_buffer is True:
-                self.connection.emtpy_queue()
-                self.data_queue.empty()
-            self._send(pack("<BBB", 0x64, 0x00, samples))
-            self.is_capturing = True
-            t = threading.Thread(target=self._get_data_thread)
-            t.start()
-            self.capture_max = samples
-            self.capture_count = 0
-
-        except Exception:
-            raise Exception("Failed to start data capture")
+        if clear_buffer is True:
+            self.connection.empty_queue()
+            self.data_queue.clear()
+        self._send_with_flush(_COMMAND_BYTE.pack(0x64, 0x00, samples))
+        self.is_capturing = True
+        t = threading.Thread(target=self._get_data_thread)
+        t.start()
+        self.capture_max = samples
+        self.capture_count = 0
 
+    @_cmd("Failed to stop data capture")
     def stop(self):
         """
         Stops capturing of data.
         """
-        try:
-            self._send(pack("<BB", 0x65, 0x00))
-        except Exception:
-            raise Exception("Failed to stop data capture")
+        self._send(_COMMAND.pack(0x65, 0x00))
         self.is_capturing = False
 
     def get_data(self):
@@ -902,10 +987,7 @@ class RadarIQ:
         :rtype: a python list, numpy ndarray or None
         """
         while self.is_capturing:
-            try:
-                yield self.data_queue.get(timeout=1)
-            except queue.Empty:
-                yield None
+            yield self.data_queue.get(timeout=1)
 
     def get_frame(self):
         """
@@ -924,166 +1006,168 @@ class RadarIQ:
         :return: A frame of data
         :rtype: a python list, numpy ndarray or None
         """
-        try:
-            return self.data_queue.get_nowait()
-        except queue.Empty:
-            return None
+        return self.data_queue.get()
 
     def _get_data_thread(self):
         mirror = 1 if self.mirror is False else -1  # multiplier for mirroring x-data
+        # Conversion factors from the mm, mm/s and mm/s^2 reported by the sensor to the units set by set_units
+        distance = self._distance_factor / 1000
+        speed = self._speed_factor / 1000
+        acceleration = self._acceleration_factor / 1000
+        # The output format is fixed for the lifetime of the object so pick the point cloud converter once. Every
+        # output uses the factors above so a call to set_units during a capture cannot apply to only some of them.
+        if self.output_format == OUTPUT_LIST:
+            convert_pointcloud = functools.partial(self._convert_pointcloud_to_list, mirror=mirror, distance=distance)
+        elif self.output_format == OUTPUT_NUMPY:
+            convert_pointcloud = functools.partial(self._convert_pointcloud_to_numpy, mirror=mirror,
+                                                   distance=distance, speed=speed)
+        else:
+            convert_pointcloud = None
         rx_frame = []
+        rx_points = []
+        rx_objects = []
 
         while self.is_capturing is True:
             try:
-                subframe = self.connection.read_from_queue()
+                subframe = self.connection.read_from_queue(CAPTURE_WAIT_TIMEOUT)
                 if subframe is not None:
-                    (command, variant) = unpack("<BB", subframe[:2])
+                    (command, variant) = _COMMAND.unpack_from(subframe)
                     if command in [0x68, 0x70] and variant == 0x01:  # is statistics packet
                         self._process_statistics(command, subframe)
 
 
                     elif command == 0x66 and variant == 0x01:  # is a point cloud packet
-                        (subframe_type, count) = unpack("<BB", subframe[2:4])
-
-                        unpacking = "<" + "hhhBh" * count
-                        unpacked = unpack(unpacking, subframe[4:])
-                        idx = 0
-                        for cnt in range(count):
-                            # SI units are needed so convert mm to m
-                            rx_frame.append(
-                                [mirror * units.convert_distance_from_si(self.distance_units, unpacked[idx] / 1000),
-                                 units.convert_distance_from_si(self.distance_units,
-                                                                unpacked[idx + 1] / 1000),
-                                 units.convert_distance_from_si(self.distance_units,
-                                                                unpacked[idx + 2] / 1000),
-                                 unpacked[idx + 3]])#,
-                                 #units.convert_speed_from_si(self.speed_units,
-                                 #                            unpacked[idx + 4] / 1000)])
-                            idx += 5
+                        (subframe_type, count) = _SUBFRAME_HEADER.unpack_from(subframe, 2)
+                        rx_points.append(np.frombuffer(subframe, dtype=POINT_CLOUD_DTYPE, count=count, offset=4))
 
                         if subframe_type == 0x02:  # End of frame
                             self.capture_count += 1
-                            if self.output_format == OUTPUT_LIST:
-                                data = rx_frame
-                            elif self.output_format == OUTPUT_NUMPY:
-                                data = self._convert_pointcloud_to_numpy(rx_frame)
-                            else:
-                                data = None
+                            # Most frames arrive in a single subframe which can be converted without joining
+                            points = rx_points[0] if len(rx_points) == 1 else np.concatenate(rx_points)
+                            data = convert_pointcloud(points) if convert_pointcloud is not None else None
 
-                            try:
-                                self.data_queue.put_nowait(data)
-                            except queue.Full:
-                                pass
+                            self.data_queue.append(data)
 
-                            rx_frame = []  # clear the buffer now the frame has been sent
+                            del rx_points[:]  # clear the buffer now the frame has been sent
 
                         if 0 < self.capture_max == self.capture_count:
                             break
 
                     elif command == 0x67 and variant == 0x01:  # is an object packet
-                        (subframe_type, count) = unpack("<BB", subframe[2:4])
-                        unpacking = "<" + "b9h" * count
-                        unpacked = unpack(unpacking, subframe[4:])
-                        idx = 0
-                        for cnt in range(count):
-                            # SI units are needed so convert mm to m
-
-                            rx_frame.append(
-                                {'tracking_id': unpacked[idx],
-                                 'x_pos': mirror * units.convert_distance_from_si(self.distance_units,
-                                                                                  unpacked[idx + 1] / 1000),
-                                 'y_pos': units.convert_distance_from_si(self.distance_units,
-                                                                         unpacked[idx + 2] / 1000),
-                                 'z_pos': units.convert_distance_from_si(self.distance_units,
-                                                                         unpacked[idx + 3] / 1000),
-                                 'x_vel': mirror * units.convert_speed_from_si(self.speed_units,
-                                                                               unpacked[idx + 4] / 1000),
-                                 'y_vel': units.convert_speed_from_si(self.speed_units, unpacked[idx + 5] / 1000),
-                                 'z_vel': units.convert_speed_from_si(self.speed_units, unpacked[idx + 6] / 1000),
-                                 'x_acc': mirror * units.convert_acceleration_from_si(self.acceleration_units,
-                                                                                      unpacked[idx + 7] / 1000),
-                                 'y_acc': units.convert_acceleration_from_si(self.acceleration_units,
-                                                                             unpacked[idx + 8] / 1000),
-                                 'z_acc': units.convert_acceleration_from_si(self.acceleration_units,
-                                                                             unpacked[idx + 9] / 1000)
-                                 })
-                            idx += 10
+                        (subframe_type, count) = _SUBFRAME_HEADER.unpack_from(subframe, 2)
+                        if self.output_format == OUTPUT_NUMPY:
+                            rx_objects.append(np.frombuffer(subframe, dtype=OBJECT_DTYPE, count=count, offset=4))
+                        else:
+                            for offset in range(4, 4 + count * _OBJECT.size, _OBJECT.size):
+                                (tracking_id, x_pos, y_pos, z_pos, x_vel, y_vel, z_vel, x_acc, y_acc,
+                                 z_acc) = _OBJECT.unpack_from(subframe, offset)
+                                rx_frame.append(
+                                    {'tracking_id': tracking_id,
+                                     'x_pos': mirror * x_pos * distance,
+                                     'y_pos': y_pos * distance,
+                                     'z_pos': z_pos * distance,
+                                     'x_vel': mirror * x_vel * speed,
+                                     'y_vel': y_vel * speed,
+                                     'z_vel': z_vel * speed,
+                                     'x_acc': mirror * x_acc * acceleration,
+                                     'y_acc': y_acc * acceleration,
+                                     'z_acc': z_acc * acceleration
+                                     })
 
                         if subframe_type == 0x02:  # End of frame
                             self.capture_count += 1
                             if self.output_format == OUTPUT_LIST:
                                 data = rx_frame
                             elif self.output_format == OUTPUT_NUMPY:
-                                data = self._convert_object_tracking_to_numpy(rx_frame)
+                                objects = rx_objects[0] if len(rx_objects) == 1 else np.concatenate(rx_objects)
+                                data = self._convert_object_tracking_to_numpy(objects, mirror, distance, speed,
+                                                                               acceleration)
                             else:
                                 data = None
 
-                            try:
-                                self.data_queue.put_nowait(data)
-                            except queue.Full:
-                                pass
+                            self.data_queue.append(data)
                             rx_frame = []  # clear the buffer now the frame has been sent
+                            del rx_objects[:]
 
                         if 0 < self.capture_max == self.capture_count:
                             break
                     else:
                         pass
-                else:
-                    time.sleep(0.01)
             except ValueError:
                 pass
         self.stop()
 
-    def _convert_pointcloud_to_numpy(self, frame):
+    def _convert_pointcloud_to_list(self, points, mirror, distance):
         """
-        Convert the whole frame from a Python list to a numpy array
-        :param frame: Frame to convert
-        :return: Data as a numpy array [[x0, y0, z0,intensity0], ...]
-        :rtype: ndarray
+        Convert the raw points of a whole frame to a Python list
+        :param points: Points as received from the sensor (POINT_CLOUD_DTYPE)
+        :param mirror: Multiplier for the x-data (1 or -1)
+        :param distance: Factor converting the mm reported by the sensor to the distance units
+        :return: Data as a list [[x0, y0, z0, intensity0], ...]
+        :rtype: list
         """
-        print("Convert point cloud to numpy")
+        positions = np.multiply(points.view(_POINT_CLOUD_POSITION)['position'], (mirror * distance, distance, distance))
+        return [[x, y, z, intensity] for (x, y, z), intensity in zip(positions.tolist(), points['intensity'].tolist())]
 
-        cnt = len(frame)
-        data = np.zeros((cnt, 5))
-        for idx, point in enumerate(frame):
-            data[idx][0] = point[0]  # x
-            data[idx][1] = point[1]  # y
-            data[idx][2] = point[2]  # z
-            data[idx][3] = point[3]  # intensity
-            data[idx][4] = point[4]  # velocity
+    def _convert_pointcloud_to_numpy(self, points, mirror, distance, speed):
+        """
+        Convert the raw points of a whole frame to a numpy array
+        :param points: Points as received from the sensor (POINT_CLOUD_DTYPE)
+        :param mirror: Multiplier for the x-data (1 or -1)
+        :param distance: Factor converting the mm reported by the sensor to the distance units
+        :param speed: Factor converting the mm/s reported by the sensor to the speed units
+        :return: Data as a float32 numpy array [[x0, y0, z0, intensity0, velocity0], ...]
+        :rtype: ndarray
+        """
+        data = np.empty((len(points), 5), dtype=np.float32)
+        # Scale and mirror x, y and z together in a single pass over the points
+        np.multiply(points.view(_POINT_CLOUD_POSITION)['position'], (mirror * distance, distance, distance),
+                    out=data[:, :3])
+        data[:, 3] = points['intensity']
+        data[:, 4] = points['velocity'] * speed
         return data
 
-    def _convert_object_tracking_to_numpy(self, frame):
+    def _convert_object_tracking_to_numpy(self, objects, mirror, distance, speed, acceleration):
         """
-        Convert the whole frame from a Python list to a numpy array
-        :param frame: Frame to convert
-        :return: Data as a numpy array [[tracking_id, xpos0, ypos0, zpos0, xvel0, yvel0, zvel0, xacc0, yacc0, zacc0]...]
+        Convert the raw objects of a whole frame to a numpy array
+        :param objects: Objects as received from the sensor (OBJECT_DTYPE)
+        :param mirror: Multiplier for the x-data (1 or -1)
+        :param distance: Factor converting the mm reported by the sensor to the distance units
+        :param speed: Factor converting the mm/s reported by the sensor to the speed units
+        :param acceleration: Factor converting the mm/s^2 reported by the sensor to the acceleration units
+        :return: Data as a float32 numpy array [[tracking_id, xpos0, ypos0, zpos0, xvel0, yvel0, zvel0, xacc0, yacc0, zacc0]...]
         :rtype: ndarray
         """
-
-        cnt = len(frame)
-        data = np.zeros((cnt, 10))
-        for idx, obj in enumerate(frame):
-            data[idx][0] = obj["tracking_id"]
-            data[idx][1] = obj["x_pos"]
-            data[idx][2] = obj["y_pos"]
-            data[idx][3] = obj["z_pos"]
-            data[idx][4] = obj["x_vel"]
-            data[idx][5] = obj["y_vel"]
-            data[idx][6] = obj["z_vel"]
-            data[idx][7] = obj["x_acc"]
-            data[idx][8] = obj["y_acc"]
-            data[idx][9] = obj["z_acc"]
+        data = np.empty((len(objects), 10), dtype=np.float32)
+        data[:, 0] = objects['tracking_id']
+        np.multiply(objects['position'], (mirror * distance, distance, distance), out=data[:, 1:4])
+        np.multiply(objects['velocity'], (mirror * speed, speed, speed), out=data[:, 4:7])
+        np.multiply(objects['acceleration'], (mirror * acceleration, acceleration, acceleration), out=data[:, 7:10])
         return data
 
     def _process_statistics(self, packet_type, frame):
         """
-        Process the statistics packet into a dictionary.
-        
-        :param packet_type: The type of statistics packet to process
+        Keep a statistics packet until the statistics are requested by :meth:`get_statistics`.
+
+        :param packet_type: The type of statistics packet
+        :type packet_type: int
+        :param frame: Frame of binary data
+        :type frame: bytes
+        """
+        self._raw_statistics[packet_type] = frame
+        self.statistics['rx_buffer_length'] = len(self.connection.rx_buffer)
+        self.statistics['rx_packet_queue'] = self.get_queue_size()
+
+    def _decode_statistics(self, packet_type, frame):
+        """
+        Decode a statistics packet into a dictionary.
+
+        :param packet_type: The type of statistics packet to decode
         :type packet_type: int
         :param frame: Frame of binary data
         :type frame: bytes
+        :return: The key for the statistics and the decoded statistics
+        :rtype: tuple
         """
         if packet_type == 0x68:  # Core
             core = {}
@@ -1094,22 +1178,19 @@ class RadarIQ:
              core['temperature_power_management'], core['temperature_rx_0'], core['temperature_rx_1'],
              core['temperature_rx_2'], core['temperature_rx_3'], core['temperature_tx_0'], core['temperature_tx_1'],
              core['temperature_tx_2'],
-             ) = unpack("<7L10h", frame[2:])
+             ) = _CORE_STATISTICS.unpack_from(frame, 2)
 
-            self.statistics['core'] = core
+            return 'core', core
 
-        elif packet_type == 0x70:  # Point Cloud
+        else:  # Point Cloud
             ptcld = {}
             (ptcld['points_aggregation_time'],
              ptcld['intensity_sort_time'], ptcld['nearest_neighbours_time'], ptcld['uart_transmission_time'],
              ptcld['filter_points_removed'], ptcld['num_transmitted_points'], ptcld['input_points_truncated_flag'],
              ptcld['output_points_truncated_flag']
-             ) = unpack("<6L2B", frame[2:])
+             ) = _POINT_CLOUD_STATISTICS.unpack_from(frame, 2)
 
-            self.statistics['point_cloud'] = ptcld
-
-        self.statistics['rx_buffer_length'] = len(self.connection.rx_buffer)
-        self.statistics['rx_packet_queue'] = self.get_queue_size()
+            return 'point_cloud', ptcld
 
     def get_statistics(self):
         """
@@ -1118,11 +1199,11 @@ class RadarIQ:
         :return: Statistics about the sensor performance
         :rtype: dict
         """
-        if self.statistics is not None:
-            s = self.statistics.copy()
-            return s
-        else:
-            return None
+        statistics = self.statistics.copy()
+        for packet_type, frame in list(self._raw_statistics.items()):
+            key, values = self._decode_statistics(packet_type, frame)
+            statistics[key] = values
+        return statistics
 
     def get_queue_size(self):
         """
@@ -1133,7 +1214,7 @@ class RadarIQ:
         :return: The size of the queue
         :rtype: int
         """
-        return self.data_queue.qsize()
+        return len(self.data_queue)
 
     def _connection_status_callback(self, status):
         """
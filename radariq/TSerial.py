@@ -1,9 +1,11 @@
 import threading
 import time
-import six
 import logging
+from collections import deque
+from contextlib import contextmanager
+from binascii import crc_hqx
 from serial import Serial, LF, SerialException
-from radariq.compatability import queue, pack, unpack, int_to_bytes
+from radariq.compatability import U16_LE, as_hex, int_to_bytes
 
 log = logging.getLogger('RadarIQ')
 
@@ -16,6 +18,10 @@ PACKET_HEAD_BYTES = int_to_bytes(PACKET_HEAD)
 PACKET_FOOT_BYTES = int_to_bytes(PACKET_FOOT)
 PACKET_ESC_BYTES = int_to_bytes(PACKET_ESC)
 PACKET_XOR_BYTES = int_to_bytes(PACKET_XOR)
+PACKET_HEAD_ESCAPED = PACKET_ESC_BYTES + int_to_bytes(PACKET_HEAD ^ PACKET_XOR)
+PACKET_FOOT_ESCAPED = PACKET_ESC_BYTES + int_to_bytes(PACKET_FOOT ^ PACKET_XOR)
+PACKET_ESC_ESCAPED = PACKET_ESC_BYTES + int_to_bytes(PACKET_ESC ^ PACKET_XOR)
+PACKET_UNESCAPE_TABLE = bytes(bytearray(c ^ PACKET_XOR for c in range(256)))
 
 # Connection Statuses
 CONNECTION_CONNECTED = 0
@@ -23,6 +29,159 @@ CONNECTION_DISCONNECTED = 1
 CONNECTION_RECONNECTED = 2
 CONNECTION_FATAL = 3
 
+# Maximum number of decoded packets held for the consumer, the oldest are discarded beyond this
+RX_QUEUE_LENGTH = 1024
+
+# Longest time (in seconds) the receive thread blocks waiting for data before checking if it should stop
+READ_TIMEOUT = 0.1
+
+# Minimum time (in seconds) between logging unexpected errors from the receive thread
+ERROR_LOG_INTERVAL = 1.0
+
+
+def crc16_ccitt(data):
+    """
+    CRC CCITT 0xFFFF algorithm.
+
+    This is the CRC-16/CCITT polynomial (0x1021) which binascii implements in C, the sensor transmits it
+    with the bytes swapped.
+
+    :param data: data to calculate the crc for
+    :type data: bytes
+    :return: The crc (byte swapped, as transmitted)
+    :rtype: int
+    """
+    crc = crc_hqx(data, 0xffff)
+    return ((crc & 255) << 8) + (crc >> 8)
+
+
+def decode_packet(src):
+    """
+    Decodes data from src.
+    Expects header and footer bytes at the start and end of packet respectively.
+    Unescapes any header, footer or escape bytes within the packet
+    warning: Does not support messages over 255.
+
+    :param src: Data to decode
+    :type src: bytes
+    :return: decoded data
+    :rtype: bytes
+    """
+    if src[0:1] != PACKET_HEAD_BYTES:
+        raise Exception("First byte of the message to decode is not a header byte")
+    if src[-1:] != PACKET_FOOT_BYTES:
+        raise Exception("Last byte of the message to decode is not a footer byte")
+    end = len(src) - 1
+    if src.find(PACKET_ESC_BYTES, 1, end) < 0 and src.find(PACKET_HEAD_BYTES, 1, end) < 0:
+        # Nothing escaped (the usual case) so the data and CRC can be read straight out of src without copying
+        # the packet body first
+        if end < 3:
+            raise Exception("Failed to extract CRC: {}".format(as_hex(src)))
+        rx_crc = U16_LE.unpack_from(src, end - 2)[0]
+        data = bytes(src[1:end - 2])
+        if crc16_ccitt(data) != rx_crc:
+            raise Exception("CRC Fail: {}".format(as_hex(src)))
+        return data
+
+    # Drop the header and footer then undo the escaping. Every fragment following an escape byte starts with
+    # an escaped byte which needs to be XORed back to its original value.
+    dest = src[1:-1].replace(PACKET_HEAD_BYTES, b"")
+    if PACKET_ESC_BYTES in dest:
+        fragments = dest.split(PACKET_ESC_BYTES)
+        dest = bytearray(fragments[0])
+        for frag in fragments[1:]:
+            dest.extend(frag[:1].translate(PACKET_UNESCAPE_TABLE))
+            dest.extend(frag[1:])
+
+    # Crc check
+    try:
+        rx_crc = U16_LE.unpack_from(dest, len(dest) - 2)[0]
+    except Exception:
+        raise Exception("Failed to extract CRC: {}".format(as_hex(src)))
+    data = bytes(dest[0: -2])
+    crc = crc16_ccitt(data)
+    if crc != rx_crc:
+        raise Exception("CRC Fail: {}".format(as_hex(src)))
+    else:
+        return data
+
+
+def encode_packet(src):
+    """
+    Encodes data from src.
+    Adds header and footer to bytes to start and end of packet respectively.
+    Escapes any header, footer or escape bytes.
+    Does not support messages over 255.
+
+    :param src Data needing to be encoded
+    :type src: bytes
+    :return: Encoded packet
+    :rtype: bytes
+    """
+
+    # Add CRC to the source string (so it can be encoded)
+    crc = crc16_ccitt(src)
+    src += U16_LE.pack(crc)
+
+    # Escape any escape bytes first so the escapes inserted for the header and footer are not escaped again
+    body = src.replace(PACKET_ESC_BYTES, PACKET_ESC_ESCAPED)
+    body = body.replace(PACKET_HEAD_BYTES, PACKET_HEAD_ESCAPED)
+    body = body.replace(PACKET_FOOT_BYTES, PACKET_FOOT_ESCAPED)
+
+    # Add the packet header and footer
+    dest = PACKET_HEAD_BYTES + body + PACKET_FOOT_BYTES
+
+    if len(dest) > 255:
+        raise Exception("Encoded packet is greater than the maximum of 255 bytes")
+
+    return dest
+
+
+class SignalledDeque(deque):
+    """
+    A deque which a consumer can wait on for another thread to append an item.
+    """
+
+    def __init__(self, maxlen=None):
+        super(SignalledDeque, self).__init__((), maxlen)
+        self._ready = threading.Event()  # Set when an item is appended
+
+    def append(self, item):
+        """
+        Add an item to the right of the deque and wake any consumer waiting in :meth:`get`.
+
+        :param item: The item to add
+        """
+        deque.append(self, item)
+        if not self._ready.is_set():
+            self._ready.set()
+
+    def get(self, timeout=None):
+        """
+        Remove and return the item on the left of the deque.
+
+        :param timeout: Seconds to wait for an item to arrive (None = do not wait)
+        :type timeout: float
+        :return: The item or None if there were no items to fetch
+        """
+        try:
+            return self.popleft()
+        except IndexError:
+            if not timeout:
+                return None
+
+        # Clear the flag before checking again so an item appended in between is not missed
+        self._ready.clear()
+        try:
+            return self.popleft()
+        except IndexError:
+            pass
+        self._ready.wait(timeout)
+        try:
+            return self.popleft()
+        except IndexError:
+            return None
+
 
 class TSerial(Serial):
     """
@@ -50,19 +209,33 @@ class TSerial(Serial):
             self.connection_status_callback = self.noop
 
         super(TSerial, self).__init__(*args, **kwargs)
+        if not self.timeout:
+            # The receive thread waits for data in a blocking read. It must not block forever (None) or spin on a
+            # non-blocking port (0).
+            self.timeout = READ_TIMEOUT
 
         self.last_comms = time.time()
-        self.thread_running = False
+        self._stop_event = threading.Event()
+        self._stop_event.set()
+        self._rx_thread = None
         self._thread_process_running = False
-        self.q = queue.Queue()
-        self.rx_buffer = b''
+        self.q = SignalledDeque(maxlen=RX_QUEUE_LENGTH)
+        self.rx_buffer = bytearray()
+        self._write_batch = threading.local()  # Packets held back by batched_writes (per thread)
         self.start()
         self.connection_status_callback(CONNECTION_CONNECTED)
 
     def flush_all(self):
-        self.rx_buffer = b''
+        del self.rx_buffer[:]
         self.flushInput()
-        self.emtpy_queue()
+        self.empty_queue()
+
+    @property
+    def thread_running(self):
+        """
+        True while the receive thread has been asked to run
+        """
+        return not self._stop_event.is_set()
 
     def start(self):
         """
@@ -70,17 +243,20 @@ class TSerial(Serial):
         """
         processor = self._packet_rx
 
-        self.thread_running = True
+        self._stop_event.clear()
         if self._thread_process_running is False:
-            t = threading.Thread(target=processor)
-            t.start()
+            self._rx_thread = threading.Thread(target=processor)
+            self._rx_thread.start()
 
     def stop(self):
         """
         Stop a receive thread from running
         """
-        self.thread_running = False
-        time.sleep(0.1)
+        self._stop_event.set()
+        if self.is_open:
+            self.cancel_read()  # Wake the receive thread if it is blocked waiting for data
+        if self._rx_thread is not None and self._rx_thread is not threading.current_thread():
+            self._rx_thread.join(1.0)
 
     def noop(self):
         """
@@ -96,72 +272,99 @@ class TSerial(Serial):
         :rtype: bytes
         """
         self._thread_process_running = True
-        while self.thread_running:
-            try:
-                msg = self.read_fast(PACKET_FOOT_BYTES, PACKET_HEAD_BYTES)
-                if msg:
-                    self.q.put_nowait(self.decode(msg))
-                else:
-                    time.sleep(0.01)
-            except queue.Full:
-                log.warning("Cannot add message to the queue because the queue is full")
-            except Exception as err:
-                pass
-                # log.info(err)
+        read_fast = self.read_fast
+        decode = self.decode
+        append = self.q.append
+        stopped = self._stop_event.is_set
+        while not stopped():
+            msg = read_fast(PACKET_FOOT_BYTES, PACKET_HEAD_BYTES)
+            if msg:
+                try:
+                    append(decode(msg))
+                except Exception as err:
+                    # A corrupt packet (bad framing or CRC) is dropped, the sensor protocol has no retransmission
+                    log.debug("Discarding packet: {}".format(err))
         self._thread_process_running = False
 
-    def read_from_queue(self):
+    def read_from_queue(self, timeout=None):
         """
-        Reads an item off the Queue.
+        Reads an item off the queue.
 
+        :param timeout: Seconds to wait for an item to arrive (None = do not wait)
+        :type timeout: float
         :return: A queued item (type dependent on the mode being used)
                  Or None if there were no items to fetch
         """
-        try:
-            return self.q.get_nowait()
-        except queue.Empty:
-            return None
+        return self.q.get(timeout)
 
-    def emtpy_queue(self):
+    def empty_queue(self):
         """
         Empties the queue
         """
-        with self.q.mutex:
-            self.q.queue.clear()
+        self.q.clear()
+
+    emtpy_queue = empty_queue  # Misspelt original name, kept for backwards compatibility
 
     def read_fast(self, footer=LF, header=None):
         """
-        Works like read_until but is much faster and does not use timeouts or max sizes.
+        Works like read_until but is much faster and does not use max sizes.
 
-        This routine can optionally be made to sleep for short periods (to decrease CPU usage)
+        When there is no complete packet buffered this blocks on the serial port (up to the port's read timeout)
+        until more data arrives. This routine can optionally be made to sleep for short periods as well.
 
         :param footer: Footer byte to search for
         :param header: Header byte to search for (optional)
         :return: The first packet found in the rx buffer
         """
-        while self.thread_running:
+        # Bind everything used per iteration to locals. rx_buffer is only ever cleared in place so it is safe to hold.
+        rx_buffer = self.rx_buffer
+        extend = rx_buffer.extend
+        find = rx_buffer.find
+        rfind = rx_buffer.rfind
+        read = self.read
+        stopped = self._stop_event.is_set
+        last_error_log = 0
+
+        while not stopped():
             try:
-                self.rx_buffer += self.read_all()
-
-                length = len(self.rx_buffer)
-                start = 0
-                for idx in range(length):
-                    if header is not None and self.rx_buffer[idx:idx + 1] == header:
-                        start = idx
-                    if self.rx_buffer[idx:idx + 1] == footer:
-                        msg = self.rx_buffer[start:idx + 1]
-                        self.rx_buffer = self.rx_buffer[idx + 1:]
-                        self.reset_comms_timer()
-                        return msg
+                foot_idx = find(footer)
+                if foot_idx >= 0:
+                    start = 0
+                    if header is not None:
+                        start = max(rfind(header, 0, foot_idx), 0)
+                    msg = bytes(rx_buffer[start:foot_idx + 1])
+                    del rx_buffer[:foot_idx + 1]
+                    self.reset_comms_timer()
+                    return msg
+
+                if header is not None:
+                    # No complete packet yet. Only the bytes from the last header onwards can become part of one so
+                    # drop anything before it, this keeps the footer search limited to the packet being received.
+                    head_idx = rfind(header)
+                    if head_idx != 0:
+                        del rx_buffer[:head_idx if head_idx > 0 else len(rx_buffer)]
 
                 if self.sleep is not None:
                     stay_awake = True if (time.time() - self.last_comms) < self.sleep else False
                     if stay_awake is False:
                         time.sleep(self.sleep)
+
+                # Block until the first byte arrives (or the read times out) then drain anything else waiting
+                # in a single read
+                first = read(1)
+                if first:
+                    extend(first)
+                    waiting = self.in_waiting
+                    if waiting:
+                        extend(read(waiting))
             except SerialException:
                 self._handle_disconnect()
             except Exception as ex:
-                print(type(ex).__name__)
+                # Rate limited so a persistent fault cannot flood the log from the receive thread
+                now = time.time()
+                if now - last_error_log > ERROR_LOG_INTERVAL:
+                    last_error_log = now
+                    log.debug("read_fast error: {}: {}".format(type(ex).__name__, ex))
 
     def send_packet(self, msg):
         """
@@ -174,108 +377,65 @@ class TSerial(Serial):
         """
         try:
             self.reset_comms_timer()
-            return self.write(self.encode(msg))
+            packet = self.encode(msg)
+            batch = getattr(self._write_batch, 'buffer', None)
+            if batch is not None:
+                batch.extend(packet)
+                return len(packet)
+            return self.write(packet)
         except SerialException:
             self._handle_disconnect()
         except Exception:
             log.warning("Failed to send data")
 
+    @contextmanager
+    def batched_writes(self):
+        """
+        Holds back the packets sent by this thread within the block then writes them all to the port in a single
+        write when the block exits.
+
+        .. code-block:: python
+
+            with connection.batched_writes():
+                for msg in messages:
+                    connection.send_packet(msg)
+        """
+        if getattr(self._write_batch, 'buffer', None) is not None:
+            yield  # Already batching, the outermost block writes everything
+            return
+
+        buffer = self._write_batch.buffer = bytearray()
+        try:
+            yield
+        finally:
+            self._write_batch.buffer = None
+            if buffer:
+                try:
+                    self.write(bytes(buffer))
+                except SerialException:
+                    self._handle_disconnect()
+
     def decode(self, src):
         """
-        Decodes data from src.
-        Expects header and footer bytes at the start and end of packet respectively.
-        Unescapes any header, footer or escape bytes within the packet
-        warning: Does not support messages over 255.
+        Decodes data from src. See :func:`decode_packet`.
 
         :param src: Data to decode
         :type src: bytes
         :return: decoded data
         :rtype: bytes
         """
-        if src[0:1] != PACKET_HEAD_BYTES:
-            raise Exception("First byte of the message to decode is not a header byte")
-        if src[-1:] != PACKET_FOOT_BYTES:
-            raise Exception("Last byte of the message to decode is not a footer byte")
-        dest = b""
-        src_idx = 0
-
-        # Loop through all bytes except footer
-        while src_idx < len(src) - 1:
-            char = src[src_idx:src_idx + 1]
-            if char == PACKET_HEAD_BYTES:
-                pass
-
-            elif char == PACKET_ESC_BYTES:
-                src_idx += 1  # Advance to the byte after the escape character
-                char = src[src_idx:src_idx + 1]
-                c = unpack("<B", char)[0]  # convert byts to int
-                dest += int_to_bytes(c ^ PACKET_XOR)
-
-            else:
-                dest += char
-
-            src_idx += 1
-
-        # Crc check
-        data = dest[0: -2]
-        crc = self.crc16_ccitt(data)
-        try:
-            rx_crc = unpack("<H", dest[-2:])[0]
-        except Exception:
-            as_hex = ''.join(format(x, '02x') for x in src)
-            raise Exception("Failed to extract CRC: {}".format(as_hex))
-        if crc != rx_crc:
-            as_hex = ''.join(format(x, '02x') for x in src)
-            raise Exception("CRC Fail: {}".format(as_hex))
-        else:
-            return data
+        return decode_packet(src)
 
     def encode(self, src):
         """
-        Encodes data from src.
-        Adds header and footer to bytes to start and end of packet respectively.
-        Escapes any header, footer or escape bytes.
-        Does not support messages over 255.
+        Encodes data from src. See :func:`encode_packet`.
 
         :param src Data needing to be encoded
         :type src: bytes
         :return: Encoded packet
         :rtype: bytes
         """
-
-        # Add CRC to the source string (so it can be encoded)
-        crc = self.crc16_ccitt(src)
-        src += pack("<H", crc)
-        src_idx = 0
-
-        # Add packet header
-        dest = PACKET_HEAD_BYTES
-        # Loop through data, check for footer bytes in data and escape them
-        while src_idx <= len(src):
-            char = src[src_idx:src_idx + 1]
-            if char == PACKET_HEAD_BYTES:
-                dest += PACKET_ESC_BYTES
-                dest += int_to_bytes(PACKET_HEAD ^ PACKET_XOR)
-
-            elif char == PACKET_FOOT_BYTES:
-                dest += PACKET_ESC_BYTES
-                dest += int_to_bytes(PACKET_FOOT ^ PACKET_XOR)
-
-            elif char == PACKET_ESC_BYTES:
-                dest += PACKET_ESC_BYTES
-                dest += int_to_bytes(PACKET_ESC ^ PACKET_XOR)
-
-            else:
-                dest += char
-            src_idx += 1
-
-        # Add the packet footer
-        dest += PACKET_FOOT_BYTES
-
-        if len(dest) > 255:
-            raise Exception("Encoded packet is greater than the maximum of 255 bytes")
-
-        return dest
+        return encode_packet(src)
 
     def reset_comms_timer(self):
         """
@@ -290,15 +450,7 @@ class TSerial(Serial):
         :param data: data to calculate the crc for
         :type data: bytes
         """
-        crc = 0xffff
-        msb = crc >> 8
-        lsb = crc & 255
-        for c in six.iterbytes(data):
-            x = c ^ msb
-            x ^= (x >> 4)
-            msb = (lsb ^ (x >> 3) ^ (x << 4)) & 255
-            lsb = (x ^ (x << 5)) & 255
-        return (lsb << 8) + msb
+        return crc16_ccitt(data)
 
     def _handle_disconnect(self):
         """
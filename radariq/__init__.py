@@ -1,3 +1,5 @@
 from radariq.RadarIQ import *
 from radariq.port_manager import find_com_port, find_com_ports
-from radariq.units_converter import convert_distance_from_si,convert_distance_to_si,convert_speed_from_si,convert_speed_to_si,convert_acceleration_from_si,convert_acceleration_to_si
\ No newline at end of file
+from radariq.units_converter import convert_distance_from_si,convert_distance_to_si,convert_speed_from_si,convert_speed_to_si,convert_acceleration_from_si,convert_acceleration_to_si,\
+    convert_distance_from_si_array,convert_distance_to_si_array,convert_speed_from_si_array,convert_speed_to_si_array,\
+    convert_acceleration_from_si_array,convert_acceleration_to_si_array
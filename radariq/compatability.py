@@ -3,6 +3,7 @@ Wrappers for python 2 & 3 compatibility
 """
 
 import struct
+import time
 import six
 
 if six.PY2:
@@ -10,38 +11,47 @@ if six.PY2:
 else:
     import queue
 
+# Clock for measuring timeouts which is not affected by changes to the system time (python 3.3+)
+monotonic = getattr(time, 'monotonic', time.time)
 
-def pack(fmt, *args):
-    if six.PY2:
-        # print(struct.pack(fmt, *args))
-        return struct.pack(fmt, *args)
-    else:
-        return struct.pack(fmt, *args)
+# Precompiled structs for fields used on every packet
+U16_LE = struct.Struct("<H")
 
+# The struct functions accept bytes on both versions so can be used directly
+pack = struct.pack
+unpack = struct.unpack
 
-def unpack(fmt, value):
-    if not isinstance(value, bytes):
-        value = value.encode('utf8')
-    return struct.unpack(fmt, value)
-
-
-def as_hex(msg):
-    """
-    Print a string as hex values
-    :param msg:
-    :return:
-    """
-    if six.PY2:
+if six.PY2:
+    def as_hex(msg):
+        """
+        Print a string as hex values
+        :param msg:
+        :return:
+        """
         return " ".join("{:02x}".format(ord(c)) for c in msg)
-    else:
+else:
+    def as_hex(msg):
+        """
+        Print a string as hex values
+        :param msg:
+        :return:
+        """
         return msg.hex()
 
 
+# Every single byte value, built once so int_to_bytes does not allocate
+_BYTES = tuple(bytes(bytearray([num])) for num in range(256))
+
+
 def int_to_bytes(num): # should work cross platform
-    return bytes(bytearray([num]))
+    if not 0 <= num < 256:
+        raise ValueError("byte must be in range(0, 256)")
+    return _BYTES[num]
+
 
-def bc_to_int(inp):
-    if six.PY2:
+if six.PY2:
+    def bc_to_int(inp):
         return ord(inp)
-    else:
-        return inp[0]
\ No newline at end of file
+else:
+    def bc_to_int(inp):
+        return inp[0]
@@ -1,5 +1,7 @@
+import threading
 from serial import Serial, SerialException
 from serial.tools import list_ports
+from radariq.compatability import monotonic
 
 """
 Find the COM port(s) RadarIQ modules are connected
@@ -8,6 +10,73 @@ Find the COM port(s) RadarIQ modules are connected
 USB_VID = 5840
 USB_PID = 3797
 
+# Seconds a listing of the serial ports is reused for, so searches made back to back do not enumerate them again
+PORT_LIST_TTL = 0.5
+
+_port_list = None
+_port_list_time = 0
+
+
+def _list_ports():
+    """
+    List the serial ports on the system, reusing the last listing if it is less than PORT_LIST_TTL seconds old.
+
+    :return: The serial ports
+    :rtype: a list of ListPortInfo objects
+    """
+    global _port_list, _port_list_time
+
+    now = monotonic()
+    if _port_list is None or now - _port_list_time >= PORT_LIST_TTL:
+        _port_list = list_ports.comports()
+        _port_list_time = now
+    return _port_list
+
+
+def _probe_port(port, results, index):
+    """
+    Check whether a serial port can be opened.
+
+    :param port: The port to check
+    :type port: ListPortInfo
+    :param results: The list the outcome is stored in, None if the port opened otherwise the exception raised
+    :type results: list
+    :param index: The position in results the outcome is stored at
+    :type index: int
+    """
+    try:
+        connection = Serial(port=port.device, baudrate=115200, timeout=1)
+        connection.close()
+        results[index] = None
+    except Exception as err:
+        # Handed back to _available_ports so errors other than the port being in use reach the caller
+        results[index] = err
+
+
+def _available_ports(ports):
+    """
+    Find which of the given ports are not currently in use.
+
+    Opening a port can take tens of milliseconds, so the ports are all probed at the same time.
+
+    :param ports: The ports to check
+    :type ports: a list of ListPortInfo objects
+    :return: The ports which could be opened, in their original order
+    :rtype: a list of ListPortInfo objects
+    """
+    results = [None] * len(ports)
+    threads = [threading.Thread(target=_probe_port, args=(port, results, index)) for index, port in enumerate(ports)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for err in results:
+        if err is not None and not isinstance(err, SerialException):
+            raise err
+    # A SerialException means the port is probably in use
+    return [port for port, err in zip(ports, results) if err is None]
+
 
 def find_com_port():
     """
@@ -53,20 +122,10 @@ def find_com_ports(all_ports=False):
     :return: A list of RadarIQ modules.
     :rtype: a list of ListPortInfo objects
     """
-    raw_ports = list_ports.comports()
-
-    ports = []
-
-    for port in raw_ports:
-        try:
-            if port.vid == USB_VID and port.pid == USB_PID:
-                if not all_ports:
-                    connection = Serial(port=port.device, baudrate=115200, timeout=1)
-                    connection.close()
-                ports.append(port)
-        except SerialException:
-            # Probably in use
-            pass
+    ports = [port for port in _list_ports() if (port.vid, port.pid) == (USB_VID, USB_PID)]
+
+    if not all_ports:
+        ports = _available_ports(ports)
 
     if len(ports) == 0:
         raise Exception("No available RadarIQ modules detected")
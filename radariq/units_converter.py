@@ -9,6 +9,7 @@ Conversion to/from SI units of meters and meters per second into other units.
 from __future__ import division
 import numbers
 from math import log10, floor
+import numpy as np
 
 # Conversion factors for distance conversion (from meters)
 distance_lookup = {
@@ -42,6 +43,25 @@ acceleration_lookup = {
 }
 
 
+def _lookup_factor(lookup, units, quantity):
+    """
+    Looks up the conversion factor for a unit.
+
+    :param lookup: The lookup dictionary for the quantity
+    :type lookup: dict
+    :param units: One of the units listed in the lookup dictionary
+    :type units: str
+    :param quantity: Name of the quantity being converted, used in the error message
+    :type quantity: str
+    :return: The conversion factor
+    :rtype: number
+    """
+    try:
+        return lookup[units]
+    except KeyError:
+        raise ValueError("Invalid units for {} conversion".format(quantity))
+
+
 def convert_distance_to_si(units, distance):
     """
     Converts distance from another unit to meters.
@@ -53,11 +73,10 @@ def convert_distance_to_si(units, distance):
     :return: The converted distance
     :rtype: float
     """
+    if not isinstance(distance, numbers.Real):
+        raise ValueError("Distance must be a number")
 
-    global distance_lookup
-    assert isinstance(distance, numbers.Real), "Distance must be a number"
-    assert units in distance_lookup, "Invalid units for distance conversion"
-    factor = distance_lookup[units]
+    factor = _lookup_factor(distance_lookup, units, "distance")
     return round_sig(distance / factor)
 
 
@@ -72,15 +91,10 @@ def convert_distance_from_si(units, distance):
     :return: The converted distance
     :rtype: float
     """
-
-    global distance_lookup
     if not isinstance(distance, numbers.Real):
         raise ValueError("Distance must be a number")
 
-    if units not in distance_lookup:
-        raise ValueError("Invalid units for distance conversion")
-
-    factor = distance_lookup[units]
+    factor = _lookup_factor(distance_lookup, units, "distance")
     return round_sig(distance * factor)
 
 
@@ -95,15 +109,11 @@ def convert_speed_to_si(units, speed):
     :return: The converted speed
     :rtype: float
     """
-    global speed_lookup
 
     if not isinstance(speed, numbers.Real):
         raise ValueError("Speed must be a number")
 
-    if units not in speed_lookup:
-        raise ValueError("Invalid units for speed conversion")
-
-    factor = speed_lookup[units]
+    factor = _lookup_factor(speed_lookup, units, "speed")
     return round_sig(speed / factor)
 
 
@@ -118,15 +128,11 @@ def convert_speed_from_si(units, speed):
     :return: The converted speed
     :rtype: float
     """
-    global speed_lookup
 
     if not isinstance(speed, numbers.Real):
         raise ValueError("Speed must be a number")
 
-    if units not in speed_lookup:
-        raise ValueError("Invalid units for speed conversion")
-
-    factor = speed_lookup[units]
+    factor = _lookup_factor(speed_lookup, units, "speed")
     return round_sig(speed * factor)
 
 
@@ -141,15 +147,11 @@ def convert_acceleration_to_si(units, acceleration):
     :return: The converted acceleration
     :rtype: float
     """
-    global acceleration_lookup
 
     if not isinstance(acceleration, numbers.Real):
         raise ValueError("Acceleration must be a number")
 
-    if units not in acceleration_lookup:
-        raise ValueError("Invalid units for acceleration conversion")
-
-    factor = acceleration_lookup[units]
+    factor = _lookup_factor(acceleration_lookup, units, "acceleration")
     return round_sig(acceleration / factor)
 
 
@@ -164,18 +166,116 @@ def convert_acceleration_from_si(units, acceleration):
     :return: The converted acceleration
     :rtype: float
     """
-    global acceleration_lookup
 
     if not isinstance(acceleration, numbers.Real):
         raise ValueError("Acceleration must be a number")
 
-    if units not in acceleration_lookup:
-        raise ValueError("Invalid units for acceleration conversion")
-
-    factor = acceleration_lookup[units]
+    factor = _lookup_factor(acceleration_lookup, units, "acceleration")
     return round_sig(acceleration * factor)
 
 
+def convert_distance_to_si_array(units, distances):
+    """
+    Converts distances from another unit to meters.
+
+    This is the vectorised form of :func:`convert_distance_to_si` for use on numpy data.
+
+    :param units: One of the units listed in the distance lookup dictionary
+    :type units: str
+    :param distances: The distances to convert from
+    :type distances: array_like
+    :return: The converted distances
+    :rtype: ndarray
+    """
+    factor = _lookup_factor(distance_lookup, units, "distance")
+    return round_sig_array(np.asarray(distances, dtype=float) / factor)
+
+
+def convert_distance_from_si_array(units, distances):
+    """
+    Converts distances from meters to other units.
+
+    This is the vectorised form of :func:`convert_distance_from_si` for use on numpy data.
+
+    :param units: One of the units listed in the distance lookup dictionary
+    :type units: str
+    :param distances: The distances to convert from
+    :type distances: array_like
+    :return: The converted distances
+    :rtype: ndarray
+    """
+    factor = _lookup_factor(distance_lookup, units, "distance")
+    return round_sig_array(np.asarray(distances, dtype=float) * factor)
+
+
+def convert_speed_to_si_array(units, speeds):
+    """
+    Converts speeds from other units to meters per second.
+
+    This is the vectorised form of :func:`convert_speed_to_si` for use on numpy data.
+
+    :param units: One of the units listed in the speed lookup dictionary
+    :type units: str
+    :param speeds: The speeds to convert from
+    :type speeds: array_like
+    :return: The converted speeds
+    :rtype: ndarray
+    """
+    factor = _lookup_factor(speed_lookup, units, "speed")
+    return round_sig_array(np.asarray(speeds, dtype=float) / factor)
+
+
+def convert_speed_from_si_array(units, speeds):
+    """
+    Converts speeds from meters per second to other units.
+
+    This is the vectorised form of :func:`convert_speed_from_si` for use on numpy data.
+
+    :param units: One of the units listed in the speed lookup dictionary
+    :type units: str
+    :param speeds: The speeds to convert from
+    :type speeds: array_like
+    :return: The converted speeds
+    :rtype: ndarray
+    """
+    factor = _lookup_factor(speed_lookup, units, "speed")
+    return round_sig_array(np.asarray(speeds, dtype=float) * factor)
+
+
+def convert_acceleration_to_si_array(units, accelerations):
+    """
+    Converts accelerations from other units to meters per square second.
+
+    This is the vectorised form of :func:`convert_acceleration_to_si` for use on numpy data.
+
+    :param units: One of the units listed in the acceleration lookup dictionary
+    :type units: str
+    :param accelerations: The accelerations to convert from
+    :type accelerations: array_like
+    :return: The converted accelerations
+    :rtype: ndarray
+    """
+    factor = _lookup_factor(acceleration_lookup, units, "acceleration")
+    return round_sig_array(np.asarray(accelerations, dtype=float) / factor)
+
+
+def convert_acceleration_from_si_array(units, accelerations):
+    """
+    Converts accelerations from meters per square second to other units.
+
+    This is the vectorised form of :func:`convert_acceleration_from_si` for use on numpy data.
+
+    :param units: One of the units listed in the acceleration lookup dictionary
+    :type units: str
+    :param accelerations: The accelerations to convert from
+    :type accelerations: array_like
+    :return: The converted accelerations
+    :rtype: ndarray
+    """
+    factor = _lookup_factor(acceleration_lookup, units, "acceleration")
+    return round_sig_array(np.asarray(accelerations, dtype=float) * factor)
+
+
 def round_sig(x, sig=4):
     """
     Rounds a number to a number of significant figures.
@@ -190,3 +290,43 @@ def round_sig(x, sig=4):
     if x == 0:
         return 0.0
     return round(x, sig - int(floor(log10(abs(x)))) - 1)
+
+
+def round_sig_array(a, sig=4):
+    """
+    Rounds every number in an array to a number of significant figures.
+
+    This is the vectorised form of :func:`round_sig` for use on numpy data and gives exactly the same results.
+
+    :param a: The numbers to round
+    :type a: array_like
+    :param sig: Number of significant figures to round to (defaults to 4)
+    :type sig: int
+    :return: Rounded numbers
+    :rtype: ndarray
+    """
+    a = np.asarray(a, dtype=float)
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        log = np.log10(np.abs(a))
+        decimals = sig - 1 - np.floor(log)
+        # Scale by whole powers of ten, which are exact up to 10**22, so the scaling is the only inexact step
+        factor = 10.0 ** np.minimum(np.abs(decimals), 22)
+        scaled = np.where(decimals >= 0, a * factor, a / factor)
+        rounded = np.round(scaled)
+        result = np.where(decimals >= 0, rounded / factor, rounded * factor)
+
+        # The scaled value can land on the other side of a tie from the exact value, and log10 can differ from the
+        # one used by round_sig next to a power of ten. Those values are left to round_sig, as are any which need a
+        # scale factor over 10**22 or are too large for np.round to have any effect.
+        fraction = np.abs(scaled) % 1
+        unsure = ((np.abs(fraction - 0.5) <= 4 * np.spacing(np.abs(scaled))) |
+                  (np.abs(log - np.round(log)) < 1e-9) |
+                  (np.abs(decimals) > 22) |
+                  (np.abs(scaled) >= 2 ** 52))
+
+    result[a == 0] = 0.0
+    finite = np.isfinite(a)
+    result[~finite] = a[~finite]
+    for index in np.flatnonzero(unsure & finite & (a != 0)):
+        result.flat[index] = round_sig(float(a.flat[index]), sig)
+    return result
@@ -8,10 +8,15 @@ Some tests for the RadarIQ API wrapper.
 These tests use a mock pyserial implementation.
 """
 
+import struct
+import sys
 import unittest
 import logging
 import six
-from radariq.RadarIQ import RadarIQ
+import numpy as np
+from radariq.RadarIQ import RadarIQ, OUTPUT_LIST, OUTPUT_NUMPY
+from radariq.TSerial import SignalledDeque
+import radariq.units_converter as units
 
 FORMAT = '%(asctime)-15s %(clientip)s %(user)-8s %(message)s'
 logging.basicConfig(format=FORMAT)
@@ -64,7 +69,7 @@ class TestMethods(unittest.TestCase):
 
         with self.assertRaisesRegex(ValueError, 'Frame rate must be an integer'):
             self.riq.set_frame_rate(1.5)
-        with self.assertRaisesRegex(ValueError, 'Frame rate must be between 0 and 30 fp'):
+        with self.assertRaisesRegex(ValueError, 'Frame rate must be between 0 and 20 fps'):
             self.riq.set_frame_rate(40)
 
     def test_get_mode(self):
@@ -91,15 +96,23 @@ class TestMethods(unittest.TestCase):
         response = self.riq.set_distance_filter(0, 2.01)
         self.assertIs(True, response)
 
-        with self.assertRaisesRegex(ValueError, 'Distance filter minimum must be a number between 0 and 10000'):
+        with self.assertRaisesRegex(ValueError, 'Distance filter minimum must be a number between 0 and 10m'):
             self.riq.set_distance_filter(-1, 1)
 
-        with self.assertRaisesRegex(ValueError, 'Distance filter maximum must be a number between 0 and 10000'):
+        with self.assertRaisesRegex(ValueError, 'Distance filter maximum must be a number between 0 and 10m'):
             self.riq.set_distance_filter(1, 99)
 
-        with self.assertRaisesRegex(ValueError, 'Distance filter minimum must be a number between 0 and 10000'):
+        with self.assertRaisesRegex(ValueError, 'Distance filter minimum must be a number between 0 and 10m'):
             self.riq.set_distance_filter(99, 1)
 
+        # The filter read back in other units (rounded to 4 sig fig) can be set again
+        for distance_units in ('ft', 'mi'):
+            self.riq.set_units(distance_units=distance_units)
+            self.riq.set_distance_filter(0, 10 * units.distance_lookup[distance_units])
+            distance_filter = self.riq.get_distance_filter()
+            response = self.riq.set_distance_filter(distance_filter['minimum'], distance_filter['maximum'])
+            self.assertIs(True, response)
+
     def test_get_angle_filter(self):
         # Test getting the angle filter
         response = self.riq.get_angle_filter()
@@ -129,6 +142,14 @@ class TestMethods(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, 'Moving filter value is invalid'):
             self.riq.set_moving_filter(9)
 
+    def test_configure(self):
+        # Test applying several settings at once
+        response = self.riq.configure(frame_rate=1, mode=1, angle_filter=(-40, 50), moving_filter=0)
+        self.assertIs(True, response)
+
+        with self.assertRaisesRegex(ValueError, 'Unknown setting: bogus'):
+            self.riq.configure(frame_rate=1, bogus=1)
+
     def test_save(self):
         # Test the save function
         response = self.riq.save()
@@ -170,6 +191,119 @@ class TestMethods(unittest.TestCase):
         self.assertIsNotNone(data)
         self.riq.stop()
 
+class FakeConnection(object):
+    """ Stands in for TSerial, the packets a test puts on the queue are handled as if the sensor sent them """
+
+    def __init__(self, *args, **kwargs):
+        self.q = SignalledDeque()
+
+    def send_packet(self, msg):
+        if msg[0:1] == b'\x65':
+            self.q.append(b'\x65\x01')  # Acknowledge a stop so it is not waited on
+
+    def read_from_queue(self, timeout=None):
+        return self.q.get(timeout)
+
+    def flush_all(self):
+        pass
+
+    def empty_queue(self):
+        self.q.clear()
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestCapture(unittest.TestCase):
+    """ Tests for decoding captured data, these do not need a sensor """
+
+    # Points are x, y, z (mm), intensity, velocity (mm/s). The frame is split over two subframes.
+    POINTS = [(1000, 2000, -500, 200, 1500), (-250, 4000, 0, 17, -300), (10, 20, 30, 255, 0)]
+    POINT_SUBFRAMES = [struct.pack('<BBBB', 0x66, 0x01, 0x01, 2) +
+                       b''.join(struct.pack('<hhhBh', *point) for point in POINTS[:2]),
+                       struct.pack('<BBBB', 0x66, 0x01, 0x02, 1) + struct.pack('<hhhBh', *POINTS[2])]
+
+    # Objects are tracking id, position (mm), velocity (mm/s), acceleration (mm/s^2)
+    OBJECTS = [(7, 1000, 2000, 300, -500, 250, 0, 100, -200, 3000), (9, -4000, 500, 0, 0, -1000, 20, 0, 0, -10)]
+    OBJECT_SUBFRAMES = [struct.pack('<BBBB', 0x67, 0x01, 0x02, 2) +
+                        b''.join(struct.pack('<b9h', *obj) for obj in OBJECTS)]
+
+    def setUp(self):
+        # The package exports the RadarIQ class under the same name as its module so the module is fetched directly
+        self.module = sys.modules['radariq.RadarIQ']
+        self.tserial = self.module.TSerial
+        self.module.TSerial = FakeConnection
+
+    def tearDown(self):
+        self.module.TSerial = self.tserial
+
+    def capture(self, output_format, subframes, mirror):
+        # Capture a single frame made up of the given subframes in mm, mm/s and mm/s^2
+        riq = RadarIQ(port='fake', output_format=output_format)
+        try:
+            riq.set_units('mm', 'mm/s', 'mm/s^2')
+            riq.set_mirror(mirror)
+            riq.start(samples=1)
+            for subframe in subframes:
+                riq.connection.q.append(subframe)
+            return riq.data_queue.get(timeout=5)
+        finally:
+            riq.close()
+
+    def test_pointcloud_list(self):
+        # Test point clouds are joined across subframes and returned as [x, y, z, intensity] lists
+        frame = self.capture(OUTPUT_LIST, self.POINT_SUBFRAMES, False)
+        self.assertIsInstance(frame, list)
+        self.assertEqual([[x, y, z, intensity] for x, y, z, intensity, velocity in self.POINTS], frame)
+
+    def test_pointcloud_list_mirrored(self):
+        # Test the x-data of point clouds is mirrored
+        frame = self.capture(OUTPUT_LIST, self.POINT_SUBFRAMES, True)
+        self.assertEqual([[-x, y, z, intensity] for x, y, z, intensity, velocity in self.POINTS], frame)
+
+    def test_pointcloud_numpy(self):
+        # Test point clouds are returned as float32 arrays of x, y, z, intensity, velocity
+        frame = self.capture(OUTPUT_NUMPY, self.POINT_SUBFRAMES, True)
+        self.assertEqual((3, 5), frame.shape)
+        self.assertEqual(np.float32, frame.dtype)
+        self.assertEqual([[-x, y, z, intensity, velocity] for x, y, z, intensity, velocity in self.POINTS],
+                         frame.tolist())
+
+    def test_object_tracking_list(self):
+        # Test objects are returned as a list of dictionaries
+        frame = self.capture(OUTPUT_LIST, self.OBJECT_SUBFRAMES, True)
+        self.assertEqual(
+            [{'tracking_id': 7, 'x_pos': -1000, 'y_pos': 2000, 'z_pos': 300, 'x_vel': 500, 'y_vel': 250, 'z_vel': 0,
+              'x_acc': -100, 'y_acc': -200, 'z_acc': 3000},
+             {'tracking_id': 9, 'x_pos': 4000, 'y_pos': 500, 'z_pos': 0, 'x_vel': 0, 'y_vel': -1000, 'z_vel': 20,
+              'x_acc': 0, 'y_acc': 0, 'z_acc': -10}], frame)
+
+    def test_object_tracking_numpy(self):
+        # Test objects are returned as float32 arrays of tracking id, position, velocity and acceleration
+        frame = self.capture(OUTPUT_NUMPY, self.OBJECT_SUBFRAMES, False)
+        self.assertEqual((2, 10), frame.shape)
+        self.assertEqual(np.float32, frame.dtype)
+        self.assertEqual([list(obj) for obj in self.OBJECTS], frame.tolist())
+
+    def test_units(self):
+        # Test the data is converted to the units set with set_units
+        riq = RadarIQ(port='fake', output_format=OUTPUT_NUMPY)
+        try:
+            riq.set_units('m', 'km/h', 'm/s^2')
+            riq.start(samples=1)
+            for subframe in self.POINT_SUBFRAMES:
+                riq.connection.q.append(subframe)
+            frame = riq.data_queue.get(timeout=5)
+        finally:
+            riq.close()
+        expected = [[x / 1000.0, y / 1000.0, z / 1000.0, intensity, velocity * 0.0036]
+                    for x, y, z, intensity, velocity in self.POINTS]
+        np.testing.assert_allclose(frame, expected, rtol=1e-6)
+
+
 ###########################################################################
 
 
@@ -0,0 +1,125 @@
+# This file is part of RadarIQ SDK
+# (C) 20019 RadarIQ <support@radariq.io>
+#
+# SPDX-License-Identifier:    MIT
+
+"""
+Tests for the packet framing and CRC of the TSerial module.
+"""
+
+import threading
+import unittest
+import six
+from radariq.TSerial import crc16_ccitt, encode_packet, decode_packet, SignalledDeque
+
+
+class TestCrc(unittest.TestCase):
+    """ Tests for the CRC calculation """
+
+    def test_check_value(self):
+        # Test the CRC-16/CCITT (0xFFFF) check value, byte swapped as transmitted
+        self.assertEqual(0xB129, crc16_ccitt(b'123456789'))
+
+    def test_empty(self):
+        # Test the CRC of no data is the initial value
+        self.assertEqual(0xFFFF, crc16_ccitt(b''))
+
+    def test_command(self):
+        # Test the CRC of a get version command
+        self.assertEqual(0x6EDB, crc16_ccitt(b'\x01\xb0\xb1\xb2\x02'))
+
+
+class TestEncodePacket(unittest.TestCase):
+    """ Tests for encoding packets """
+
+    def test_encode(self):
+        # Test a packet with nothing to escape
+        self.assertEqual(b'\xb0\x01\x00\x2e\x3e\xb1', encode_packet(b'\x01\x00'))
+
+    def test_encode_escapes_payload(self):
+        # Test header, footer and escape bytes in the payload are escaped
+        self.assertEqual(b'\xb0\x01\xb2\xb4\xb2\xb5\xb2\xb6\x02\xdb\x6e\xb1', encode_packet(b'\x01\xb0\xb1\xb2\x02'))
+
+    def test_encode_escapes_crc(self):
+        # Test header and footer bytes in the CRC are escaped
+        self.assertEqual(b'\xb0\x02\x59\xb2\xb4\xb2\xb5\xb1', encode_packet(b'\x02\x59'))
+
+    def test_encode_too_long(self):
+        # Test packets over 255 bytes are rejected
+        with self.assertRaises(Exception):
+            encode_packet(b'\x00' * 254)
+
+
+class TestDecodePacket(unittest.TestCase):
+    """ Tests for decoding packets """
+    if six.PY2:
+        assertRaisesRegex = unittest.TestCase.assertRaisesRegexp  # this was renamed in python 3.2
+
+    def test_decode(self):
+        # Test a packet with nothing escaped
+        self.assertEqual(b'\x01\x00', decode_packet(b'\xb0\x01\x00\x2e\x3e\xb1'))
+
+    def test_round_trip(self):
+        # Test packets containing every special byte decode back to the original data
+        for data in (b'\x01\x00', b'\x01\xb0\xb1\xb2\x02', b'\x02\x59', b'\xb2\xb2\xb0', bytes(bytearray(range(200)))):
+            self.assertEqual(data, decode_packet(encode_packet(data)))
+
+    def test_decode_crc_fail(self):
+        # Test a corrupted packet is rejected
+        with self.assertRaisesRegex(Exception, 'CRC Fail'):
+            decode_packet(b'\xb0\x01\x01\x2e\x3e\xb1')
+
+    def test_decode_escaped_crc_fail(self):
+        # Test a corrupted packet containing escapes is rejected
+        with self.assertRaisesRegex(Exception, 'CRC Fail'):
+            decode_packet(b'\xb0\x01\xb2\xb4\xb2\xb5\xb2\xb6\x03\xdb\x6e\xb1')
+
+    def test_decode_empty(self):
+        # Test a packet with no data or CRC is rejected
+        with self.assertRaisesRegex(Exception, 'Failed to extract CRC'):
+            decode_packet(b'\xb0\xb1')
+
+    def test_decode_only_escape(self):
+        # Test a packet holding only an escape byte is rejected
+        with self.assertRaisesRegex(Exception, 'Failed to extract CRC'):
+            decode_packet(b'\xb0\xb2\xb1')
+
+    def test_decode_no_header(self):
+        # Test a packet without a header byte is rejected
+        with self.assertRaisesRegex(Exception, 'not a header byte'):
+            decode_packet(b'\x01\x00\x2e\x3e\xb1')
+
+    def test_decode_no_footer(self):
+        # Test a packet without a footer byte is rejected
+        with self.assertRaisesRegex(Exception, 'not a footer byte'):
+            decode_packet(b'\xb0\x01\x00\x2e\x3e')
+
+
+class TestSignalledDeque(unittest.TestCase):
+    """ Tests for the deque used to pass packets and frames between threads """
+
+    def test_get(self):
+        # Test items come off in order and an empty deque returns None without waiting
+        q = SignalledDeque(maxlen=2)
+        for item in (1, 2, 3):
+            q.append(item)
+        self.assertEqual([2, 3, None], [q.get(), q.get(), q.get()])
+
+    def test_get_wait(self):
+        # Test a waiting get is woken by an append from another thread
+        q = SignalledDeque()
+        timer = threading.Timer(0.05, q.append, (1,))
+        timer.start()
+        self.assertEqual(1, q.get(timeout=5))
+        timer.join()
+
+    def test_get_timeout(self):
+        # Test a waiting get gives up when nothing is appended
+        self.assertIsNone(SignalledDeque().get(timeout=0.01))
+
+
+###########################################################################
+
+
+if __name__ == '__main__':
+    unittest.main()
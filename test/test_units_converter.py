@@ -30,6 +30,23 @@ class TestRoundSig(unittest.TestCase):
         rounded = units.round_sig(0, 1)
         self.assertEqual(0, rounded)
 
+    def test_sig_array(self):
+        """ Round an array of numbers to 4 sig fig"""
+        rounded = units.round_sig_array([1.235845, -0.0123456, 0, 98765.4], 4)
+        self.assertEqual([1.236, -0.01235, 0, 98770], rounded.tolist())
+
+    def test_sig_array_ties(self):
+        """ Round numbers which are close to halfway between the rounded values the same as round_sig"""
+        values = [123.45, 61.855, 0.10005, -2.0045, 99995]
+        rounded = units.round_sig_array(values, 4)
+        self.assertEqual([units.round_sig(value, 4) for value in values], rounded.tolist())
+        self.assertEqual([123.5, 61.85, 0.1001, -2.005, 100000], rounded.tolist())
+
+    def test_sig_array_subnormal(self):
+        """ Round numbers too small to scale to 4 sig fig"""
+        rounded = units.round_sig_array([1e-310, -5e-324], 4)
+        self.assertEqual([1e-310, -5e-324], rounded.tolist())
+
 
 class TestDistanceConversions(unittest.TestCase):
     """ Tests for the distance conversions """
@@ -91,6 +108,35 @@ class TestDistanceConversions(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, 'Invalid units for distance conversion'):
             converted = units.convert_distance_from_si('bogus', 1)
 
+    def test_to_si_error_case(self):
+        # Test conversion to SI units fails if bogus units are set
+        with self.assertRaisesRegex(ValueError, 'Invalid units for distance conversion'):
+            converted = units.convert_distance_to_si('bogus', 1)
+
+    def test_convert_array_from_mm_to_m(self):
+        # Test conversions of arrays of distances to SI units
+        converted = units.convert_distance_to_si_array('mm', [1010, 2020, 3030])
+        self.assertEqual([1.01, 2.02, 3.03], converted.tolist())
+
+    def test_convert_array_from_m_to_ft(self):
+        # Test conversions of arrays of distances from SI units
+        converted = units.convert_distance_from_si_array('ft', [7.01, 0, -7.01])
+        self.assertEqual([23, 0, -23], converted.tolist())
+
+    def test_convert_array_matches_scalar(self):
+        # Test array conversions give exactly the same values as the scalar conversions, including near ties
+        values = [61.855, 123.45, 0.10005, 1010, -7.01]
+        for unit in ('m', 'mm', 'ft'):
+            self.assertEqual([units.convert_distance_to_si(unit, value) for value in values],
+                             units.convert_distance_to_si_array(unit, values).tolist())
+            self.assertEqual([units.convert_distance_from_si(unit, value) for value in values],
+                             units.convert_distance_from_si_array(unit, values).tolist())
+
+    def test_array_error_case(self):
+        # Test array conversion fails if bogus units are set
+        with self.assertRaisesRegex(ValueError, 'Invalid units for distance conversion'):
+            converted = units.convert_distance_to_si_array('bogus', [1])
+
 
 class TestSpeedConversions(unittest.TestCase):
     """ Tests for the speed conversions """
@@ -152,6 +198,11 @@ class TestSpeedConversions(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, 'Invalid units for speed conversion'):
             converted = units.convert_speed_from_si('bogus', 1)
 
+    def test_convert_array_from_km_per_hour_to_meters_per_second(self):
+        # Test conversions of arrays of speeds to SI units
+        converted = units.convert_speed_to_si_array('km/h', [13, 45])
+        self.assertEqual([3.611, 12.5], converted.tolist())
+
 
 class TestAccelerationConversions(unittest.TestCase):
     """ Tests for the acceleration conversions """
@@ -192,3 +243,8 @@ class TestAccelerationConversions(unittest.TestCase):
         # Test conversion fails if bogus units are set
         with self.assertRaisesRegex(ValueError, 'Invalid units for acceleration conversion'):
             converted = units.convert_acceleration_from_si('bogus', 1)
+
+    def test_convert_array_from_meters_per_square_second_to_ft_per_square_second(self):
+        # Test conversions of arrays of accelerations from SI units
+        converted = units.convert_acceleration_from_si_array('ft/s^2', [7, 1.001])
+        self.assertEqual([22.97, 3.284], converted.tolist())